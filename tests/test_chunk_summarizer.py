@@ -1,3 +1,4 @@
+from dataclasses import replace
 from pathlib import Path
 
 from xtrc.core.metadata_store import MetadataStore
@@ -66,3 +67,46 @@ def test_apply_summaries_sets_chunk_llm_summary(tmp_path: Path) -> None:
     updated = summarizer.apply_summaries([chunk], summaries)
 
     assert updated[0].llm_summary == summaries[chunk.chunk_id]
+
+
+def test_chunk_summarizer_skips_store_lookup_for_known_summaries(tmp_path: Path) -> None:
+    store = MetadataStore(tmp_path / "metadata.db")
+    client = FakeGeminiClient()
+    summarizer = GeminiChunkSummarizer(store, client, model_name="gemini-2.5-flash")
+    chunk = _chunk()
+    summarizer.summarize_chunks([chunk])
+
+    lookups: list[list[str]] = []
+    lookup = store.get_cached_chunk_summaries
+
+    def tracking_lookup(keys: list[str]) -> dict[str, str]:
+        lookups.append(keys)
+        return lookup(keys)
+
+    store.get_cached_chunk_summaries = tracking_lookup  # type: ignore[method-assign]
+    summaries, latency = summarizer.summarize_chunks([chunk])
+
+    assert summaries[chunk.chunk_id]
+    assert latency == 0
+    assert lookups == []
+
+
+def test_chunk_summarizer_memory_cache_is_bounded(tmp_path: Path) -> None:
+    store = MetadataStore(tmp_path / "metadata.db")
+    client = FakeGeminiClient()
+    summarizer = GeminiChunkSummarizer(
+        store, client, model_name="gemini-2.5-flash", memory_cache_size=2
+    )
+    chunks = [
+        replace(_chunk(), chunk_id=f"chunk-{i}", content_hash=f"hash-{i}", text=f"code {i}")
+        for i in range(3)
+    ]
+
+    summaries, _ = summarizer.summarize_chunks(chunks)
+    again, latency = summarizer.summarize_chunks(chunks)
+
+    assert len(summaries) == 3
+    assert again == summaries
+    assert latency == 0
+    assert len(summarizer._memory_cache) == 2
+    assert client.calls == 3
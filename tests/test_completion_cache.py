@@ -0,0 +1,39 @@
+from xtrc.llm.completion_cache import CompletionCache, prompt_digest
+
+
+def test_completion_cache_hits_by_model_and_prompt() -> None:
+    cache = CompletionCache(max_entries=2)
+    calls: list[tuple[str, object]] = []
+
+    def compute(model_name: str, prompt: object) -> str:
+        calls.append((model_name, prompt))
+        return f"out-{len(calls)}"
+
+    assert cache.get_or_compute("m", "prompt", compute) == "out-1"
+    assert cache.get_or_compute("m", "prompt", compute) == "out-1"
+    assert cache.get_or_compute("other", "prompt", compute) == "out-2"
+    assert len(calls) == 2
+
+
+def test_completion_cache_evicts_least_recently_used() -> None:
+    cache = CompletionCache(max_entries=2)
+    calls: list[object] = []
+
+    def compute(model_name: str, prompt: object) -> str:
+        calls.append(prompt)
+        return str(prompt)
+
+    cache.get_or_compute("m", "a", compute)
+    cache.get_or_compute("m", "b", compute)
+    cache.get_or_compute("m", "a", compute)
+    cache.get_or_compute("m", "c", compute)
+    cache.get_or_compute("m", "a", compute)
+    cache.get_or_compute("m", "b", compute)
+
+    assert calls == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_prompt_digest_distinguishes_part_boundaries() -> None:
+    assert prompt_digest(("ab", "c")) != prompt_digest(("a", "bc"))
+    assert prompt_digest("abc") == prompt_digest("abc")
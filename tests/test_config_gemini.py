@@ -8,6 +8,7 @@ def test_settings_gemini_defaults(monkeypatch) -> None:
     monkeypatch.delenv("GEMINI_TIMEOUT_SECONDS", raising=False)
     monkeypatch.delenv("GEMINI_ENABLE_REWRITE", raising=False)
     monkeypatch.delenv("GEMINI_CACHE_SIZE", raising=False)
+    monkeypatch.delenv("GEMINI_REWRITE_GRACE_SECONDS", raising=False)
 
     settings = Settings.from_env()
 
@@ -17,6 +18,7 @@ def test_settings_gemini_defaults(monkeypatch) -> None:
     assert settings.gemini_timeout_seconds == 2.0
     assert settings.gemini_enable_rewrite is False
     assert settings.gemini_cache_size == 128
+    assert settings.gemini_rewrite_grace_seconds == 1.0
 
 
 def test_settings_gemini_env_parsing_and_clamping(monkeypatch) -> None:
@@ -26,6 +28,7 @@ def test_settings_gemini_env_parsing_and_clamping(monkeypatch) -> None:
     monkeypatch.setenv("GEMINI_TIMEOUT_SECONDS", "0")
     monkeypatch.setenv("GEMINI_ENABLE_REWRITE", "1")
     monkeypatch.setenv("GEMINI_CACHE_SIZE", "-4")
+    monkeypatch.setenv("GEMINI_REWRITE_GRACE_SECONDS", "-1")
 
     settings = Settings.from_env()
 
@@ -35,6 +38,7 @@ def test_settings_gemini_env_parsing_and_clamping(monkeypatch) -> None:
     assert settings.gemini_timeout_seconds == 0.1
     assert settings.gemini_enable_rewrite is True
     assert settings.gemini_cache_size == 1
+    assert settings.gemini_rewrite_grace_seconds == 0.0
 
 
 def test_settings_invalid_numeric_values_fall_back_to_defaults(monkeypatch) -> None:
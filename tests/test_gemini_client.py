@@ -1,12 +1,18 @@
 import time
 
 import pytest
+from google.api_core.exceptions import ServiceUnavailable
 
 import xtrc.llm.gemini_client as gemini_client
 from xtrc.llm.gemini_client import GeminiClient, GeminiClientError, GeminiTimeoutError
 
 
-def _install_fake_genai(monkeypatch: pytest.MonkeyPatch, responses: list[str], delay: float = 0.0) -> list[tuple[str, str]]:
+def _install_fake_genai(
+    monkeypatch: pytest.MonkeyPatch,
+    responses: list[str],
+    delay: float = 0.0,
+    error: Exception | None = None,
+) -> list[tuple[str, str]]:
     calls: list[tuple[str, str]] = []
 
     class FakeResponse:
@@ -17,11 +23,26 @@ def _install_fake_genai(monkeypatch: pytest.MonkeyPatch, responses: list[str], d
         def __init__(self, model_name: str) -> None:
             self.model_name = model_name
 
-        def generate_content(self, prompt: str, generation_config: dict[str, object]) -> FakeResponse:
+        def generate_content(
+            self,
+            prompt: str,
+            generation_config: dict[str, object],
+            request_options: dict[str, object],
+        ) -> FakeResponse:
             _ = generation_config
-            calls.append((self.model_name, prompt))
+            # Mimic the SDK: without an explicit retry=None, transient errors are retried.
+            attempts = 1 if request_options.get("retry", "default") is None else 3
+            for _attempt in range(attempts):
+                calls.append((self.model_name, prompt))
+                if error is None:
+                    break
+            if error is not None:
+                raise error
             if delay > 0:
-                time.sleep(delay)
+                timeout = float(request_options["timeout"])  # type: ignore[arg-type]
+                time.sleep(min(delay, timeout))
+                if delay > timeout:
+                    raise TimeoutError("deadline exceeded")
             if not responses:
                 return FakeResponse('{"file": "src/default.py", "line": 1, "reason": "default"}')
             return FakeResponse(responses.pop(0))
@@ -61,6 +82,16 @@ def test_gemini_client_handles_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
         _ = client.complete_json("pick best result")
 
 
+def test_gemini_client_does_not_retry_unavailable_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _install_fake_genai(monkeypatch, [], error=ServiceUnavailable("overloaded"))
+
+    client = GeminiClient(api_key="test", default_model="gemini-1.5-flash", timeout_seconds=1.0)
+    with pytest.raises(GeminiClientError, match="overloaded"):
+        _ = client.complete_json("pick best result")
+
+    assert len(calls) == 1
+
+
 def test_gemini_client_parses_json_code_fence() -> None:
     payload = GeminiClient._parse_json_object(
         """```json
@@ -74,3 +105,45 @@ def test_gemini_client_parses_json_code_fence() -> None:
 def test_gemini_client_raises_on_invalid_json() -> None:
     with pytest.raises(GeminiClientError):
         _ = GeminiClient._parse_json_object("not json")
+
+
+def test_gemini_client_parses_object_embedded_in_prose() -> None:
+    payload = GeminiClient._parse_json_object('Best match: {"file": "src/a.py", "meta": {"line": 3}} done')
+    assert payload == {"file": "src/a.py", "meta": {"line": 3}}
+
+
+def test_gemini_client_reuses_model_per_name(monkeypatch: pytest.MonkeyPatch) -> None:
+    _install_fake_genai(monkeypatch, [])
+    built: list[str] = []
+    fake_model = gemini_client.genai.GenerativeModel
+
+    def counting_model(model_name: str) -> object:
+        built.append(model_name)
+        return fake_model(model_name)
+
+    monkeypatch.setattr(gemini_client.genai, "GenerativeModel", counting_model)
+    client = GeminiClient(api_key="test", default_model="gemini-1.5-flash", timeout_seconds=1.0)
+    client.complete_json("first prompt")
+    client.complete_json("second prompt")
+    client.complete_json("third prompt", model_name="gemini-2.5-flash")
+
+    assert built == ["gemini-1.5-flash", "gemini-2.5-flash"]
+
+
+def test_gemini_client_parse_rewrite_text_variants() -> None:
+    assert GeminiClient._parse_rewrite_text("  create post route  ") == "create post route"
+    assert GeminiClient._parse_rewrite_text("create post route\nexplanation") == "create post route"
+    assert GeminiClient._parse_rewrite_text('{"query": "delete user"}') == "delete user"
+    assert GeminiClient._parse_rewrite_text('"update profile"') == "update profile"
+
+
+def test_gemini_client_sends_prompt_parts_as_one_user_turn(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _install_fake_genai(monkeypatch, ['{"file": "src/a.py", "line": 1, "reason": "ok"}'])
+
+    client = GeminiClient(api_key="test", default_model="gemini-1.5-flash", timeout_seconds=1.0)
+    payload, _ = client.complete_json(("Instructions\n", "Query: x\n"))
+
+    assert payload["file"] == "src/a.py"
+    assert calls[0][1] == [
+        {"role": "user", "parts": [{"text": "Instructions\n"}, {"text": "Query: x\n"}]}
+    ]
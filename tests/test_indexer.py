@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from xtrc.core.chunker import ChunkBuilder
+from xtrc.core.embeddings import EmbeddingResult
+from xtrc.core.indexer import Indexer
+from xtrc.core.metadata_store import MetadataStore
+from xtrc.core.models import CodeChunk
+from xtrc.core.parser import TreeSitterCodeParser
+
+
+class FakeEmbeddingService:
+    dimension = 4
+
+    def embed_documents(self, texts: list[str]) -> EmbeddingResult:
+        return EmbeddingResult(keys=list(texts), vectors=np.ones((len(texts), 4), dtype=np.float32))
+
+
+class FakeVectorStore:
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.fail_on = fail_on
+        self.upserted: list[str] = []
+
+    def ensure_collection(self, repo_path: str, vector_size: int, recreate: bool = False) -> bool:
+        _ = (repo_path, vector_size, recreate)
+        return False
+
+    def delete_file_chunks(self, repo_path: str, file_path: str) -> None:
+        _ = (repo_path, file_path)
+
+    def delete_chunk_ids(self, repo_path: str, chunk_ids: list[str]) -> None:
+        _ = (repo_path, chunk_ids)
+
+    def upsert_chunks(self, repo_path: str, chunks: list[CodeChunk], vectors: np.ndarray) -> None:
+        _ = (repo_path, vectors)
+        file_path = chunks[0].file_path
+        if file_path == self.fail_on:
+            raise RuntimeError("qdrant unavailable")
+        self.upserted.append(file_path)
+
+
+def _indexer(tmp_path: Path, vector_store: FakeVectorStore) -> tuple[Indexer, MetadataStore]:
+    metadata_store = MetadataStore(tmp_path / "meta.sqlite")
+    indexer = Indexer(
+        metadata_store=metadata_store,
+        parser=TreeSitterCodeParser(),
+        chunk_builder=ChunkBuilder(min_tokens=200, max_tokens=800, target_tokens=500),
+        embedding_service=FakeEmbeddingService(),  # type: ignore[arg-type]
+        vector_store=vector_store,  # type: ignore[arg-type]
+    )
+    return indexer, metadata_store
+
+
+def _write_repo(root: Path) -> Path:
+    repo = root / "repo"
+    repo.mkdir()
+    (repo / "a.py").write_text("def create_post():\n    return 1\n", encoding="utf-8")
+    (repo / "b.py").write_text("def delete_post():\n    return 2\n", encoding="utf-8")
+    return repo
+
+
+def test_index_records_files_after_vector_writes(tmp_path: Path) -> None:
+    repo = _write_repo(tmp_path)
+    store = FakeVectorStore()
+    indexer, metadata_store = _indexer(tmp_path, store)
+
+    stats = indexer.index(repo)
+
+    assert stats.files_indexed == 2
+    assert store.upserted == ["a.py", "b.py"]
+    assert set(metadata_store.get_file_hashes(str(repo.resolve()))) == {"a.py", "b.py"}
+
+
+def test_index_does_not_record_file_when_vector_write_fails(tmp_path: Path) -> None:
+    repo = _write_repo(tmp_path)
+    indexer, metadata_store = _indexer(tmp_path, FakeVectorStore(fail_on="b.py"))
+
+    with pytest.raises(RuntimeError, match="qdrant unavailable"):
+        indexer.index(repo)
+
+    assert set(metadata_store.get_file_hashes(str(repo.resolve()))) == {"a.py"}
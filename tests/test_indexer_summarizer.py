@@ -1,5 +1,28 @@
+from dataclasses import replace
+from pathlib import Path
+
+from xtrc.core.metadata_store import MetadataStore
 from xtrc.core.models import CodeChunk
 from xtrc.indexer.summarizer import IndexChunkSummarizer
+from xtrc.llm.text_client import LLMClientError
+
+
+class FlakyLLM:
+    def complete_text(self, prompt: str, *, model_name: str | None = None) -> tuple[str, int]:
+        _ = model_name
+        if "broken" in prompt:
+            raise LLMClientError("boom")
+        return "Creates a post record.", 5
+
+
+class CountingLLM:
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def complete_text(self, prompt: str, *, model_name: str | None = None) -> tuple[str, int]:
+        _ = model_name
+        self.prompts.append(prompt)
+        return "Creates a post record.", 5
 
 
 def _chunk() -> CodeChunk:
@@ -37,3 +60,29 @@ def test_build_embedding_text_uses_enriched_semantics_only() -> None:
     assert "Method: POST" in text
     assert "Route: /posts" in text
     assert "router.post" not in text
+
+
+def test_summarize_chunks_keeps_successes_when_one_call_fails(tmp_path: Path) -> None:
+    store = MetadataStore(tmp_path / "metadata.db")
+    summarizer = IndexChunkSummarizer(metadata_store=store, llm_client=FlakyLLM(), model_name="m")
+    good = _chunk()
+    bad = replace(_chunk(), chunk_id="c2", text="broken()")
+
+    summaries, latency = summarizer.summarize_chunks([good, bad])
+
+    assert summaries == {"c1": "Creates a post record."}
+    assert latency == 5
+
+
+def test_summarize_chunks_sends_duplicate_prompts_once(tmp_path: Path) -> None:
+    store = MetadataStore(tmp_path / "metadata.db")
+    llm = CountingLLM()
+    summarizer = IndexChunkSummarizer(metadata_store=store, llm_client=llm, model_name="m")
+    first = _chunk()
+    copy = replace(_chunk(), chunk_id="c2", start_line=20, end_line=25)
+
+    summaries, latency = summarizer.summarize_chunks([first, copy])
+
+    assert summaries == {"c1": "Creates a post record.", "c2": "Creates a post record."}
+    assert latency == 5
+    assert len(llm.prompts) == 1
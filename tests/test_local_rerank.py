@@ -1,3 +1,8 @@
+import sys
+import threading
+import time
+import types
+
 from xtrc.core.models import CodeChunk, QueryMatch
 from xtrc.query.rerank import LocalReranker
 
@@ -44,6 +49,7 @@ def test_local_reranker_reorders_top_candidates(monkeypatch) -> None:
     assert used is True
     assert latency is not None
     assert out[0].chunk.file_path == "b.py"
+    assert out[0].explanation.endswith("local reranker score=3.000")
 
 
 def test_local_reranker_disabled() -> None:
@@ -55,3 +61,39 @@ def test_local_reranker_disabled() -> None:
     assert out == matches
     assert used is False
     assert latency is None
+
+
+def test_local_reranker_handles_extreme_logits(monkeypatch) -> None:
+    reranker = LocalReranker(enabled=True, timeout_seconds=2.0)
+    matches = [_match("a", "a.py", 0.80), _match("b", "b.py", 0.50)]
+
+    monkeypatch.setattr(reranker, "_predict_scores", lambda query, items: [-1000.0, 1000.0])
+
+    out, used, _ = reranker.rerank("create post", matches)
+
+    assert used is True
+    assert [match.chunk.file_path for match in out] == ["b.py", "a.py"]
+    assert abs(out[0].score - (0.7 * 0.50 + 0.3)) < 1e-9
+    assert abs(out[1].score - 0.7 * 0.80) < 1e-9
+
+
+def test_local_reranker_loads_model_once_under_concurrency(monkeypatch) -> None:
+    constructed: list[str] = []
+
+    class SlowCrossEncoder:
+        def __init__(self, model_name: str) -> None:
+            time.sleep(0.05)
+            constructed.append(model_name)
+
+    fake_module = types.ModuleType("sentence_transformers")
+    fake_module.CrossEncoder = SlowCrossEncoder  # type: ignore[attr-defined]
+    monkeypatch.setitem(sys.modules, "sentence_transformers", fake_module)
+
+    reranker = LocalReranker(enabled=True)
+    threads = [threading.Thread(target=reranker.warmup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert constructed == [reranker.model_name]
@@ -0,0 +1,51 @@
+import io
+import logging
+
+import orjson
+import pytest
+
+from xtrc.logging import setup_logging
+
+
+def _configure(monkeypatch: pytest.MonkeyPatch, log_format: str) -> io.StringIO:
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    monkeypatch.setattr(root, "level", root.level)
+    for flag in ("logThreads", "logProcesses", "logMultiprocessing"):
+        monkeypatch.setattr(logging, flag, getattr(logging, flag))
+    monkeypatch.setenv("AINAV_LOG_FORMAT", log_format)
+    monkeypatch.delenv("AINAV_LOG_LEVEL", raising=False)
+
+    setup_logging()
+
+    stream = io.StringIO()
+    root.handlers[0].setStream(stream)  # type: ignore[attr-defined]
+    return stream
+
+
+def test_json_format_emits_one_object_per_record(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream = _configure(monkeypatch, "json")
+    logger = logging.getLogger("xtrc.test")
+
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("failed %s", "indexing")
+    logger.info("with stack", stack_info=True)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    first = orjson.loads(lines[0])
+    assert first["level"] == "ERROR"
+    assert first["logger"] == "xtrc.test"
+    assert first["message"] == "failed indexing"
+    assert "RuntimeError: boom" in first["exc"]
+    assert "Stack (most recent call last)" in orjson.loads(lines[1])["stack"]
+
+
+def test_plain_format_omits_timestamp(monkeypatch: pytest.MonkeyPatch) -> None:
+    stream = _configure(monkeypatch, "plain")
+
+    logging.getLogger("xtrc.test").info("ready")
+
+    assert stream.getvalue() == "INFO [xtrc.test] ready\n"
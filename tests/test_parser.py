@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from xtrc.core.parser import TreeSitterCodeParser
+
+
+def test_parse_symbols_detects_routes_in_non_ascii_source() -> None:
+    parser = TreeSitterCodeParser()
+    content = (
+        "# Café routes — ünïcode comment\n"
+        "@app.post('/posts')\n"
+        "def create_post():\n"
+        "    return {'message': 'créé'}\n"
+        "\n"
+        "def on_save_handler():\n"
+        "    pass\n"
+    )
+
+    symbols = parser.parse_symbols(Path("app.py"), "python", content)
+
+    route = next(symbol for symbol in symbols if symbol.kind == "route" and symbol.name)
+    assert route.name == "create_post"
+    assert route.start_line == 2
+    assert "créé" in route.text
+    handler = next(symbol for symbol in symbols if symbol.name == "on_save_handler")
+    assert handler.kind == "handler"
+
+
+def test_parse_symbols_names_js_route_calls() -> None:
+    parser = TreeSitterCodeParser()
+    content = "router.get('/users/:id', (req, res) => res.json({ nom: 'Zoë' }))\n"
+
+    symbols = parser.parse_symbols(Path("routes.js"), "javascript", content)
+
+    routes = [symbol for symbol in symbols if symbol.kind == "route"]
+    assert [route.name for route in routes] == ["GET /users/:id"]
@@ -41,7 +41,6 @@ class FakeScorer:
         symbol_terms: list[str],
         route_intent: str | None = None,
         route_method: str | None = None,
-        route_resource: str | None = None,
         structural_terms: list[str] | None = None,
     ) -> tuple[float, float, float, float, float, float]:
         _ = query
@@ -49,7 +48,6 @@ class FakeScorer:
         _ = symbol_terms
         _ = route_intent
         _ = route_method
-        _ = route_resource
         _ = structural_terms
         return vector_score, vector_score, 0.0, 0.0, 0.0, 0.0
 
@@ -58,9 +56,15 @@ class FakeReranker:
     def __init__(self) -> None:
         self.calls = 0
 
-    def decide(self, query: str, matches: list[object]) -> RerankDecision:
+    def decide(
+        self,
+        query: str,
+        matches: list[object],
+        query_embedding: np.ndarray | None = None,
+    ) -> RerankDecision:
         _ = query
         _ = matches
+        _ = query_embedding
         self.calls += 1
         return RerankDecision(
             selection=QuerySelection(
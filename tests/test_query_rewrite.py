@@ -28,6 +28,40 @@ def test_query_rewriter_rewrites_and_caches() -> None:
     assert llm.calls == 1
 
 
+def test_query_rewriter_shares_cache_across_trivial_variants() -> None:
+    llm = FakeLLM()
+    rewriter = QueryRewriter(llm_client=llm, model_name="m", enabled=True, cache_size=64)
+
+    outputs = {
+        rewriter.rewrite(query)[0]
+        for query in ("create user", "Create User", "create  user", " create user? ")
+    }
+
+    assert outputs == {"backend POST route or function that creates user posts"}
+    assert llm.calls == 1
+
+
+def test_query_rewriter_prompts_with_original_case_and_detects_no_change() -> None:
+    class EchoLLM:
+        def __init__(self) -> None:
+            self.prompts: list[str] = []
+
+        def complete_text(self, prompt: str, *, model_name: str | None = None) -> tuple[str, int]:
+            _ = model_name
+            self.prompts.append(prompt)
+            return "getUserById handler?", 7
+
+    llm = EchoLLM()
+    rewriter = QueryRewriter(llm_client=llm, model_name="m", enabled=True)
+
+    query, changed, latency = rewriter.rewrite("  getUserById   handler ")
+
+    assert "Query:\ngetUserById   handler\n" in llm.prompts[0]
+    assert query == "  getUserById   handler "
+    assert changed is False
+    assert latency == 7
+
+
 def test_query_rewriter_fallback_when_disabled() -> None:
     rewriter = QueryRewriter(llm_client=None, model_name="m", enabled=False)
     query, changed, latency = rewriter.rewrite("find post creation")
@@ -48,3 +48,22 @@ def test_noise_penalty_applied() -> None:
 
     assert decision.multiplier < 1.3 * 1.2
     assert "noise/script penalty" in ", ".join(decision.reasons)
+
+
+def test_evaluate_batch_matches_per_chunk_evaluation() -> None:
+    heuristics = RankingHeuristics(route_boost=1.3, noise_penalty=0.7, intent_boost=1.2)
+    chunks = [
+        _chunk(),
+        _chunk(intent_tags=["create_resource", "test_script"], file_path="tests/test_posts.py"),
+    ]
+
+    batch = heuristics.evaluate_batch("create post api endpoint", chunks)
+
+    assert batch == [heuristics.evaluate("create post api endpoint", chunk) for chunk in chunks]
+
+
+def test_chunk_keyword_terms_include_route_terms() -> None:
+    chunk = _chunk(route_method="POST", route_resource="blogPosts")
+
+    assert {"post", "blogposts"} <= chunk.keyword_term_set
+    assert chunk.keyword_term_set is chunk.keyword_term_set
@@ -1,24 +1,38 @@
 import json
+import time
+
+import numpy as np
 
 from xtrc.core.models import CodeChunk, QueryMatch
 from xtrc.llm.reranker import GeminiReranker
 
 
 class FakeGeminiClient:
-    def __init__(self, payload: dict[str, object]) -> None:
+    def __init__(
+        self,
+        payload: dict[str, object],
+        *,
+        rewritten: str = "find score calculation path for user",
+        rewrite_delay: float = 0.0,
+    ) -> None:
         self.payload = payload
+        self.rewritten = rewritten
+        self.rewrite_delay = rewrite_delay
         self.complete_calls = 0
         self.rewrite_calls = 0
         self.last_prompt = ""
 
-    def complete_json(self, prompt: str, *, model_name: str | None = None) -> tuple[dict[str, object], int]:
+    def complete_json(
+        self, prompt: tuple[str, ...], *, model_name: str | None = None
+    ) -> tuple[dict[str, object], int]:
         self.complete_calls += 1
-        self.last_prompt = prompt
+        self.last_prompt = "".join(prompt)
         return self.payload, 42
 
     def rewrite_query(self, prompt: str, *, model_name: str | None = None) -> tuple[str, int]:
         self.rewrite_calls += 1
-        return "find score calculation path for user", 11
+        time.sleep(self.rewrite_delay)
+        return self.rewritten, 11
 
 
 def _make_match(file_path: str, start_line: int, end_line: int, vector_score: float) -> QueryMatch:
@@ -74,6 +88,7 @@ def test_reranker_uses_gemini_for_low_confidence_and_caps_candidates_to_ten() ->
     assert decision.selection.line == 12
     assert decision.gemini_latency_ms == 42
     assert client.complete_calls == 1
+    assert reranker._executor is None
 
     json_payload = client.last_prompt.split("Candidates (JSON):\n", maxsplit=1)[1]
     candidates = json.loads(json_payload)
@@ -112,4 +127,125 @@ def test_reranker_optional_query_rewrite() -> None:
     assert decision.rewritten_query == "find score calculation path for user"
     assert decision.gemini_latency_ms == 53
     assert client.rewrite_calls == 1
+    # The speculative rerank of the original query is discarded in favour of the rewrite.
+    assert client.complete_calls == 2
+    assert "User Query:\nfind score calculation path for user\n" in client.last_prompt
+
+
+def test_reranker_uses_speculative_rerank_when_rewrite_is_slow() -> None:
+    client = FakeGeminiClient(
+        payload={"file": "src/a.py", "line": 10, "reason": "best match"},
+        rewrite_delay=0.2,
+    )
+    reranker = GeminiReranker(
+        client,
+        model_name="gemini-1.5-flash",
+        threshold=0.85,
+        enable_rewrite=True,
+        rewrite_grace_seconds=0.01,
+    )
+
+    matches = [_make_match("src/a.py", 10, 20, vector_score=0.4)]
+    decision = reranker.decide("user score", matches)
+
+    assert decision is not None
+    assert decision.used_gemini is True
+    assert decision.rewritten_query is None
+    assert decision.gemini_latency_ms == 42
+    assert client.rewrite_calls == 1
     assert client.complete_calls == 1
+    assert "User Query:\nuser score\n" in client.last_prompt
+
+
+def test_reranker_keeps_speculative_rerank_when_rewrite_is_unchanged() -> None:
+    client = FakeGeminiClient(
+        payload={"file": "src/a.py", "line": 10, "reason": "best match"},
+        rewritten="User  score",
+    )
+    reranker = GeminiReranker(
+        client,
+        model_name="gemini-1.5-flash",
+        threshold=0.85,
+        enable_rewrite=True,
+    )
+
+    matches = [_make_match("src/a.py", 10, 20, vector_score=0.4)]
+    decision = reranker.decide("user score", matches)
+
+    assert decision is not None
+    assert decision.rewritten_query == "User  score"
+    assert decision.gemini_latency_ms == 42
+    assert client.complete_calls == 1
+
+
+def test_reranker_reuses_decision_for_near_duplicate_query() -> None:
+    client = FakeGeminiClient(payload={"file": "src/candidate_1.py", "line": 12, "reason": "best match"})
+    reranker = GeminiReranker(client, model_name="gemini-1.5-flash", threshold=0.85)
+    matches = [_make_match(f"src/candidate_{i}.py", 10, 20, vector_score=0.4) for i in range(3)]
+
+    first = reranker.decide("where is score computed", matches, query_embedding=np.array([1.0, 0.0]))
+    second = reranker.decide("where's the score computed", matches, query_embedding=np.array([0.99, 0.05]))
+    other = reranker.decide("delete a user", matches, query_embedding=np.array([0.0, 1.0]))
+
+    assert first is not None and second is not None and other is not None
+    assert second.selection == first.selection
+    assert second.used_gemini is False
+    assert second.gemini_latency_ms is None
+    assert other.used_gemini is True
+    assert client.complete_calls == 2
+
+
+def test_reranker_cache_requires_identical_candidates() -> None:
+    client = FakeGeminiClient(payload={"file": "src/candidate_1.py", "line": 12, "reason": "best match"})
+    reranker = GeminiReranker(client, model_name="gemini-1.5-flash", threshold=0.85)
+    matches = [_make_match(f"src/candidate_{i}.py", 10, 20, vector_score=0.4) for i in range(3)]
+    embedding = np.array([1.0, 0.0])
+
+    reranker.decide("where is score computed", matches, query_embedding=embedding)
+    reranker.decide("where is score computed", list(reversed(matches)), query_embedding=embedding)
+
+    assert client.complete_calls == 2
+
+
+def test_reranker_rejects_malformed_gemini_payload() -> None:
+    client = FakeGeminiClient(payload={"file": "src/top.py", "line": "12", "reason": "  "})
+    reranker = GeminiReranker(client, model_name="gemini-1.5-flash", threshold=0.85)
+
+    matches = [_make_match("src/top.py", 10, 20, vector_score=0.4)]
+    decision = reranker.decide("where is score computed", matches)
+
+    assert decision is not None
+    assert decision.selection.source == "vector"
+    assert "invalid fields: line, reason" in decision.selection.reason
+
+
+def test_reranker_drops_low_scoring_tail_candidates() -> None:
+    client = FakeGeminiClient(payload={"file": "src/candidate_0.py", "line": 12, "reason": "best"})
+    reranker = GeminiReranker(client, model_name="gemini-1.5-flash", threshold=0.85)
+    scores = [0.8, 0.7, 0.1, 0.5, 0.39, 0.2]
+    matches = [
+        _make_match(f"src/candidate_{i}.py", 10, 20, vector_score=score)
+        for i, score in enumerate(scores)
+    ]
+
+    reranker.decide("where is score computed", matches)
+
+    json_payload = client.last_prompt.split("Candidates (JSON):\n", maxsplit=1)[1]
+    files = [candidate["file_path"] for candidate in json.loads(json_payload)]
+    assert files == ["src/candidate_0.py", "src/candidate_1.py", "src/candidate_2.py", "src/candidate_3.py"]
+
+
+def test_reranker_cache_hit_does_not_report_earlier_rewrite() -> None:
+    client = FakeGeminiClient(payload={"file": "src/candidate_1.py", "line": 12, "reason": "best"})
+    reranker = GeminiReranker(
+        client, model_name="gemini-1.5-flash", threshold=0.85, enable_rewrite=True
+    )
+    matches = [_make_match(f"src/candidate_{i}.py", 10, 20, vector_score=0.4) for i in range(3)]
+
+    first = reranker.decide("user score", matches, query_embedding=np.array([1.0, 0.0]))
+    second = reranker.decide("score of user", matches, query_embedding=np.array([0.99, 0.05]))
+
+    assert first is not None and second is not None
+    assert first.rewritten_query == "find score calculation path for user"
+    assert second.used_gemini is False
+    assert second.rewritten_query is None
@@ -33,7 +33,6 @@ def test_hybrid_scoring_boosts_route_intent_and_structure() -> None:
         symbol_terms=["create_post", "post"],
         route_intent="create",
         route_method="POST",
-        route_resource="post",
         structural_terms=["create", "post", "posts"],
     )
 
@@ -0,0 +1,50 @@
+import google.generativeai as genai
+import pytest
+from google.api_core.exceptions import DeadlineExceeded, ServiceUnavailable
+
+from xtrc.llm.text_client import LLMClientError, LLMClientTimeoutError, LLMTextClient
+
+
+def _install_fake_model(monkeypatch: pytest.MonkeyPatch, error: Exception) -> list[dict[str, object]]:
+    calls: list[dict[str, object]] = []
+
+    class FakeModel:
+        def __init__(self, model_name: str) -> None:
+            self.model_name = model_name
+
+        def generate_content(
+            self,
+            prompt: str,
+            generation_config: dict[str, object],
+            request_options: dict[str, object],
+        ) -> object:
+            _ = (prompt, generation_config)
+            # Mimic the SDK: without an explicit retry=None, transient errors are retried.
+            attempts = 1 if request_options.get("retry", "default") is None else 3
+            for _attempt in range(attempts):
+                calls.append(request_options)
+            raise error
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr(genai, "configure", lambda api_key: None)
+    monkeypatch.setattr(genai, "GenerativeModel", FakeModel)
+    return calls
+
+
+def test_gemini_provider_does_not_retry_unavailable_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _install_fake_model(monkeypatch, ServiceUnavailable("overloaded"))
+    client = LLMTextClient(provider="gemini", model="gemini-2.5-flash", timeout_seconds=1.5)
+
+    with pytest.raises(LLMClientError, match="overloaded"):
+        client.complete_text("summarize this")
+
+    assert len(calls) == 1
+    assert calls[0]["timeout"] == 1.5
+
+
+def test_gemini_provider_maps_deadline_to_timeout_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    _install_fake_model(monkeypatch, DeadlineExceeded("too slow"))
+    client = LLMTextClient(provider="gemini", model="gemini-2.5-flash", timeout_seconds=1.0)
+
+    with pytest.raises(LLMClientTimeoutError):
+        client.complete_text("summarize this")
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from xtrc.core.models import CodeChunk
+from xtrc.core.vector_store import QdrantVectorStore
+
+
+def _chunk(idx: int) -> CodeChunk:
+    return CodeChunk(
+        chunk_id=f"c{idx}",
+        repo_path="/tmp/repo",
+        file_path=f"src/mod_{idx}.py",
+        language="python",
+        start_line=1,
+        end_line=4,
+        symbol=f"fn_{idx}",
+        symbol_kind="function",
+        description=f"function {idx}",
+        text=f"def fn_{idx}():\n    return {idx}",
+        content_hash=f"h{idx}",
+        tokens=8,
+        keywords=["fn"],
+        symbol_terms=["fn"],
+    )
+
+
+def test_search_many_matches_individual_searches(tmp_path: Path) -> None:
+    store = QdrantVectorStore(tmp_path / "qdrant")
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(6, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    store.ensure_collection("/tmp/repo", 8)
+    store.upsert_chunks("/tmp/repo", [_chunk(idx) for idx in range(6)], vectors)
+
+    batched = store.search_many("/tmp/repo", vectors[:3], limit=2)
+
+    assert len(batched) == 3
+    for query_vector, hits in zip(vectors[:3], batched, strict=True):
+        single = store.search("/tmp/repo", query_vector, limit=2)
+        assert [hit.chunk_id for hit in hits] == [hit.chunk_id for hit in single]
+    assert batched[0][0].chunk_id == "c0"
+
+
+def test_search_many_returns_empty_lists_for_unknown_repo(tmp_path: Path) -> None:
+    store = QdrantVectorStore(tmp_path / "qdrant")
+
+    assert store.search_many("/tmp/missing", np.zeros((2, 8), dtype=np.float32), limit=3) == [[], []]
+
+
+def test_ensure_collection_skips_probes_once_size_is_known(tmp_path: Path, monkeypatch) -> None:
+    store = QdrantVectorStore(tmp_path / "qdrant")
+    assert store.ensure_collection("/tmp/repo", 8) is True
+
+    def _fail(**_: object) -> bool:
+        raise AssertionError("collection_exists should not be called for a known collection")
+
+    monkeypatch.setattr(store.client, "collection_exists", _fail)
+    assert store.ensure_collection("/tmp/repo", 8) is False
+
+    monkeypatch.undo()
+    assert store.ensure_collection("/tmp/repo", 8, recreate=True) is True
+    assert store.ensure_collection("/tmp/repo", 16) is True
+
+
+def test_dot_collections_score_like_cosine(tmp_path: Path) -> None:
+    store = QdrantVectorStore(tmp_path / "qdrant")
+    vectors = np.array([[3.0, 0.0, 0.0, 0.0], [0.0, 0.5, 0.5, 0.0]], dtype=np.float32)
+    store.upsert_chunks("/tmp/repo", [_chunk(0), _chunk(1)], vectors)
+
+    hits = store.search("/tmp/repo", np.array([10.0, 0.0, 0.0, 0.0], dtype=np.float32), limit=2)
+
+    assert hits[0].chunk_id == "c0"
+    assert abs(hits[0].score - 1.0) < 1e-5
+    assert abs(hits[1].score) < 1e-5
+
+
+def test_upsert_rejects_misaligned_chunks_and_vectors(tmp_path: Path) -> None:
+    store = QdrantVectorStore(tmp_path / "qdrant")
+    vectors = np.ones((2, 8), dtype=np.float32)
+
+    with pytest.raises(ValueError, match="3 chunks but 2 vectors"):
+        store.upsert_chunks("/tmp/repo", [_chunk(idx) for idx in range(3)], vectors)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import asyncio
 from pathlib import Path
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from xtrc.core.daemon import AinavDaemon
 from xtrc.schemas import (
@@ -32,7 +33,7 @@ def build_router(daemon: AinavDaemon) -> APIRouter:
         )
 
     @router.post("/query", response_model=QueryResponse)
-    async def query_repo(request: QueryRequest) -> QueryResponse:
+    async def query_repo(request: QueryRequest) -> ORJSONResponse:
         outcome = await asyncio.to_thread(
             daemon.query,
             request.repo_path,
@@ -40,11 +41,14 @@ def build_router(daemon: AinavDaemon) -> APIRouter:
             request.top_k,
         )
         repo_path = str(Path(request.repo_path).expanduser().resolve())
-        return QueryResponse(
+        # Every field comes from daemon-built values, so the models are constructed without
+        # validation and returned as a ready response; response_model still documents the schema
+        # but FastAPI then skips its own validate-and-serialize pass.
+        response = QueryResponse.model_construct(
             repo_path=repo_path,
             query=request.query,
             results=[
-                QueryResult(
+                QueryResult.model_construct(
                     file_path=match.chunk.file_path,
                     start_line=match.chunk.start_line,
                     end_line=match.chunk.end_line,
@@ -64,7 +68,7 @@ def build_router(daemon: AinavDaemon) -> APIRouter:
             ],
             duration_ms=outcome.duration_ms,
             selection=(
-                QuerySelection(
+                QuerySelection.model_construct(
                     file=outcome.selection.file,
                     line=outcome.selection.line,
                     reason=outcome.selection.reason,
@@ -78,6 +82,7 @@ def build_router(daemon: AinavDaemon) -> APIRouter:
             gemini_latency_ms=outcome.gemini_latency_ms,
             rewritten_query=outcome.rewritten_query,
         )
+        return ORJSONResponse(content=response.model_dump(mode="json"))
 
     @router.get("/status", response_model=StatusResponse)
     async def status(repo_path: str = ".") -> StatusResponse:
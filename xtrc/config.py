@@ -38,6 +38,8 @@ class Settings:
     port: int = 8765
     model_name: str = "BAAI/bge-base-en-v1.5"
     qdrant_dirname: str = "qdrant"
+    qdrant_grpc_url: str = ""
+    qdrant_quantization: bool = True
     sqlite_name: str = "metadata.db"
     embedding_cache_name: str = "embeddings.db"
     max_batch_size: int = 256
@@ -46,6 +48,7 @@ class Settings:
     gemini_threshold: float = 0.85
     gemini_timeout_seconds: float = 2.0
     gemini_enable_rewrite: bool = False
+    gemini_rewrite_grace_seconds: float = 1.0
     gemini_cache_size: int = 128
     gemini_summarize_on_index: bool = False
     gemini_summary_model: str = ""
@@ -67,11 +70,14 @@ class Settings:
         host = os.getenv("AINAV_HOST", "127.0.0.1")
         port = _env_int("AINAV_PORT", 8765)
         model_name = os.getenv("AINAV_MODEL", "BAAI/bge-base-en-v1.5")
+        qdrant_grpc_url = os.getenv("QDRANT_GRPC_URL", "").strip()
+        qdrant_quantization = _env_bool("QDRANT_QUANTIZATION", True)
         use_gemini = _env_bool("USE_GEMINI", False)
         gemini_model = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
         gemini_threshold = _env_float("GEMINI_THRESHOLD", 0.85)
         gemini_timeout_seconds = _env_float("GEMINI_TIMEOUT_SECONDS", 2.0)
         gemini_enable_rewrite = _env_bool("GEMINI_ENABLE_REWRITE", False)
+        gemini_rewrite_grace_seconds = _env_float("GEMINI_REWRITE_GRACE_SECONDS", 1.0)
         gemini_cache_size = _env_int("GEMINI_CACHE_SIZE", 128)
         gemini_summarize_on_index = _env_bool("GEMINI_SUMMARIZE_ON_INDEX", False)
         gemini_summary_model = os.getenv("GEMINI_SUMMARY_MODEL", "").strip()
@@ -94,11 +100,14 @@ class Settings:
             host=host,
             port=port,
             model_name=model_name,
+            qdrant_grpc_url=qdrant_grpc_url,
+            qdrant_quantization=qdrant_quantization,
             use_gemini=use_gemini,
             gemini_model=gemini_model,
             gemini_threshold=max(0.0, min(1.0, gemini_threshold)),
             gemini_timeout_seconds=max(0.1, gemini_timeout_seconds),
             gemini_enable_rewrite=gemini_enable_rewrite,
+            gemini_rewrite_grace_seconds=max(0.0, gemini_rewrite_grace_seconds),
             gemini_cache_size=max(1, gemini_cache_size),
             gemini_summarize_on_index=gemini_summarize_on_index,
             gemini_summary_model=gemini_summary_model,
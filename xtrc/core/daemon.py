@@ -77,7 +77,11 @@ class AinavDaemon:
             parser = TreeSitterCodeParser()
             chunk_builder = ChunkBuilder(min_tokens=200, max_tokens=800, target_tokens=500)
             embedding_service = EmbeddingService(self.settings, metadata_store)
-            vector_store = QdrantVectorStore(data_root / self.settings.qdrant_dirname)
+            vector_store = QdrantVectorStore(
+                data_root / self.settings.qdrant_dirname,
+                grpc_url=self.settings.qdrant_grpc_url or None,
+                quantize=self.settings.qdrant_quantization,
+            )
             scorer = HybridScorer()
 
             indexer = Indexer(
@@ -237,6 +241,7 @@ class AinavDaemon:
             threshold=settings.gemini_threshold,
             enable_rewrite=settings.gemini_enable_rewrite,
             max_candidates=10,
+            rewrite_grace_seconds=settings.gemini_rewrite_grace_seconds,
         )
 
     def _build_chunk_summarizer(
@@ -266,6 +271,14 @@ class AinavDaemon:
             max_chars=self.settings.gemini_summary_max_chars,
         )
 
+    def warmup(self) -> None:
+        if self._local_reranker is None:
+            return
+        try:
+            self._local_reranker.warmup()
+        except Exception as exc:
+            logger.warning("Local reranker warmup failed: %s", exc)
+
     def index(self, repo_path: str | Path, rebuild: bool) -> IndexStats:
         resolved = self._resolve_repo_path(repo_path)
         key = str(resolved)
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 
 from xtrc.core.chunker import ChunkBuilder
 from xtrc.core.embeddings import EmbeddingService
 from xtrc.core.metadata_store import MetadataStore
-from xtrc.core.models import IndexStats
+from xtrc.core.models import CodeChunk, IndexStats
 from xtrc.core.parser import TreeSitterCodeParser
 from xtrc.core.repo import detect_language, sha256_text, walk_source_files
 from xtrc.core.vector_store import QdrantVectorStore
@@ -16,6 +18,14 @@ from xtrc.indexer.summarizer import IndexChunkSummarizer
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _PendingWrite:
+    future: Future[None]
+    chunks: list[CodeChunk]
+    relative_path: str
+    file_hash: str
+
+
 class Indexer:
     def __init__(
         self,
@@ -32,6 +42,9 @@ class Indexer:
         self.embedding_service = embedding_service
         self.vector_store = vector_store
         self.chunk_summarizer = chunk_summarizer
+        self._vector_writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="xtrc-vector-write"
+        )
 
     def index(self, repo_path: Path, rebuild: bool = False) -> IndexStats:
         started = time.perf_counter()
@@ -87,42 +100,68 @@ class Indexer:
         files_indexed = 0
         chunks_indexed = 0
 
-        for file_path, relative_path, language, text, file_hash in changed_files:
-            old_chunk_ids = self.metadata_store.get_chunk_ids_for_file(repo_key, relative_path)
-            if old_chunk_ids:
-                self.vector_store.delete_chunk_ids(repo_key, old_chunk_ids)
-                self.metadata_store.delete_chunks_by_ids(old_chunk_ids)
-
-            symbols = self.parser.parse_symbols(file_path, language, text)
-            chunks = self.chunk_builder.build_chunks(
-                repo_path=repo_path,
-                file_path=file_path,
-                language=language,
-                file_hash=file_hash,
-                content=text,
-                symbols=symbols,
-            )
-
-            if chunks:
-                if self.chunk_summarizer is not None:
-                    summaries, summary_latency_ms = self.chunk_summarizer.summarize_chunks(chunks)
-                    if summaries:
-                        chunks = self.chunk_summarizer.apply_summaries(chunks, summaries)
-                        logger.info(
-                            "Applied cached/generated summaries for %s chunks=%d latency_ms=%d",
-                            relative_path,
-                            len(summaries),
-                            summary_latency_ms,
-                        )
-
-                embedding_input = [IndexChunkSummarizer.build_embedding_text(chunk) for chunk in chunks]
-                vectors = self.embedding_service.embed_documents(embedding_input).vectors
-                self.vector_store.upsert_chunks(repo_key, chunks, vectors)
-                self.metadata_store.upsert_chunks(chunks)
-                chunks_indexed += len(chunks)
+        # Vector writes for one file run on the writer thread while the next file is parsed,
+        # summarized and embedded. Its metadata is only recorded once the write has landed.
+        pending: _PendingWrite | None = None
+        try:
+            for file_path, relative_path, language, text, file_hash in changed_files:
+                symbols = self.parser.parse_symbols(file_path, language, text)
+                chunks = self.chunk_builder.build_chunks(
+                    repo_path=repo_path,
+                    file_path=file_path,
+                    language=language,
+                    file_hash=file_hash,
+                    content=text,
+                    symbols=symbols,
+                )
 
-            self.metadata_store.upsert_file_hash(repo_key, relative_path, file_hash)
-            files_indexed += 1
+                vectors = None
+                if chunks:
+                    if self.chunk_summarizer is not None:
+                        summaries, summary_latency_ms = self.chunk_summarizer.summarize_chunks(
+                            chunks
+                        )
+                        if summaries:
+                            chunks = self.chunk_summarizer.apply_summaries(chunks, summaries)
+                            logger.info(
+                                "Applied cached/generated summaries for %s chunks=%d latency_ms=%d",
+                                relative_path,
+                                len(summaries),
+                                summary_latency_ms,
+                            )
+
+                    embedding_input = [
+                        IndexChunkSummarizer.build_embedding_text(chunk) for chunk in chunks
+                    ]
+                    vectors = self.embedding_service.embed_documents(embedding_input).vectors
+
+                # The vector store is only touched from one thread at a time.
+                if pending is not None:
+                    self._finish_write(repo_key, pending)
+                    pending = None
+
+                old_chunk_ids = self.metadata_store.get_chunk_ids_for_file(repo_key, relative_path)
+                if old_chunk_ids:
+                    self.vector_store.delete_chunk_ids(repo_key, old_chunk_ids)
+                    self.metadata_store.delete_chunks_by_ids(old_chunk_ids)
+
+                if chunks:
+                    future = self._vector_writer.submit(
+                        self.vector_store.upsert_chunks, repo_key, chunks, vectors
+                    )
+                    pending = _PendingWrite(future, chunks, relative_path, file_hash)
+                    chunks_indexed += len(chunks)
+                else:
+                    self.metadata_store.upsert_file_hash(repo_key, relative_path, file_hash)
+                files_indexed += 1
+
+            if pending is not None:
+                self._finish_write(repo_key, pending)
+                pending = None
+        finally:
+            if pending is not None:
+                # Never leave a write in flight behind a failed run.
+                wait([pending.future])
 
         self.metadata_store.set_repo_last_indexed(repo_key)
 
@@ -145,3 +184,8 @@ class Indexer:
             chunks_indexed=chunks_indexed,
             duration_ms=duration_ms,
         )
+
+    def _finish_write(self, repo_key: str, pending: _PendingWrite) -> None:
+        pending.future.result()
+        self.metadata_store.upsert_chunks(pending.chunks)
+        self.metadata_store.upsert_file_hash(repo_key, pending.relative_path, pending.file_hash)
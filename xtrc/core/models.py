@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from typing import Literal
 
+from xtrc.core.tokenizer import normalize_terms
+
 
 @dataclass(frozen=True)
 class SymbolBlock:
@@ -38,6 +41,21 @@ class CodeChunk:
     structural_terms: list[str] = field(default_factory=list)
     llm_summary: str | None = None
 
+    @cached_property
+    def intent_tag_set(self) -> frozenset[str]:
+        return frozenset(self.intent_tags)
+
+    @cached_property
+    def keyword_term_set(self) -> frozenset[str]:
+        # Every term a query keyword can match: keywords, symbol and structural terms, plus the
+        # route method and resource.
+        terms = {*self.keywords, *self.symbol_terms, *self.structural_terms}
+        if self.route_method:
+            terms.add(self.route_method.lower())
+        if self.route_resource:
+            terms.update(normalize_terms(self.route_resource))
+        return frozenset(terms)
+
 
 @dataclass(frozen=True)
 class IndexStats:
@@ -68,7 +86,24 @@ class QueryMatch:
     structural_score: float = 0.0
     matched_intents: list[str] = field(default_factory=list)
     matched_keywords: list[str] = field(default_factory=list)
-    explanation: str = ""
+    heuristic_reasons: list[str] = field(default_factory=list)
+    local_rerank_score: float | None = None
+
+    @cached_property
+    def explanation(self) -> str:
+        # Formatted on first access so candidates that never reach a response skip the work.
+        bits = [
+            f"semantic={self.vector_score:.3f}",
+            f"keyword={self.keyword_score:.3f}",
+            f"symbol={self.symbol_score:.3f}",
+            f"intent={self.intent_score:.3f}",
+            f"structural={self.structural_score:.3f}",
+        ]
+        if self.heuristic_reasons:
+            bits.append("heuristics=" + ", ".join(self.heuristic_reasons))
+        if self.local_rerank_score is not None:
+            bits.append(f"local reranker score={self.local_rerank_score:.3f}")
+        return "; ".join(bits)
 
 
 SelectionSource = Literal["vector", "gemini"]
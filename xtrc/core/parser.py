@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
 
 from tree_sitter import Language, Parser
@@ -12,9 +14,12 @@ import tree_sitter_typescript as ts_typescript
 
 from xtrc.core.models import SymbolBlock
 
-_ROUTE_PATTERN = re.compile(r"\.(get|post|put|delete|patch|route|use)\s*\(", re.IGNORECASE)
-_PATH_ARG_PATTERN = re.compile(r"\(\s*['\"]/[^'\"\)]*['\"]")
-_HANDLER_NAME_PATTERN = re.compile(r"handler|callback", re.IGNORECASE)
+# Byte patterns so candidate nodes can be matched against the encoded source without decoding.
+_ROUTE_PATTERN = re.compile(rb"\.(get|post|put|delete|patch|route|use)\s*\(", re.IGNORECASE)
+_PATH_ARG_PATTERN = re.compile(rb"\(\s*['\"]/[^'\"\)]*['\"]")
+_HANDLER_NAME_PATTERN = re.compile(rb"handler|callback", re.IGNORECASE)
+_DEF_NAME_PATTERN = re.compile(rb"def\s+([A-Za-z_][A-Za-z0-9_]*)")
+_APP_DECORATOR_PATTERN = re.compile(rb"@app")
 
 
 @dataclass(frozen=True)
@@ -42,8 +47,16 @@ def _set_parser_language(parser: Parser, language: Language) -> None:
         parser.set_language(language)
 
 
-def _node_text(source: bytes, start_byte: int, end_byte: int) -> str:
-    return source[start_byte:end_byte].decode("utf-8", errors="ignore")
+def _node_text(source: memoryview, start_byte: int, end_byte: int) -> str:
+    return str(source[start_byte:end_byte], "utf-8", "ignore")
+
+
+def _node_name(source: memoryview, node: object) -> tuple[str | None, bool]:
+    name_node = node.child_by_field_name("name")
+    if name_node is None:
+        return None, False
+    raw = source[name_node.start_byte : name_node.end_byte]
+    return str(raw, "utf-8", "ignore"), _HANDLER_NAME_PATTERN.search(raw) is not None
 
 
 def _line_range(node: object) -> tuple[int, int]:
@@ -82,20 +95,24 @@ class TreeSitterCodeParser:
         if parser is None:
             return []
 
-        source = content.encode("utf-8")
-        tree = parser.parse(source)
+        encoded = content.encode("utf-8")
+        tree = parser.parse(encoded)
+        source = memoryview(encoded)
         root = tree.root_node
 
+        collect = self._collect_python if language == "python" else self._collect_js_ts
         drafts: list[_SymbolDraft] = []
-        stack = [root]
-        while stack:
-            node = stack.pop()
-            stack.extend(reversed(node.children))
-
-            if language == "python":
-                self._collect_python(node, source, drafts)
-            else:
-                self._collect_js_ts(node, source, drafts)
+        # Pre-order walk with a cursor so no per-node child lists are materialized.
+        cursor = tree.walk()
+        walking = True
+        while walking:
+            collect(cursor.node, source, drafts)
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    walking = False
+                    break
 
         self._add_major_blocks(root, source, drafts)
 
@@ -114,17 +131,15 @@ class TreeSitterCodeParser:
 
         return sorted(unique.values(), key=lambda s: (s.start_line, s.end_line, s.kind))
 
-    def _collect_python(self, node: object, source: bytes, drafts: list[_SymbolDraft]) -> None:
+    def _collect_python(self, node: object, source: memoryview, drafts: list[_SymbolDraft]) -> None:
         node_type = node.type
 
         if node_type in {"function_definition", "async_function_definition"}:
-            name_node = node.child_by_field_name("name")
-            name = _node_text(source, name_node.start_byte, name_node.end_byte) if name_node else None
-            kind = "handler" if name and _HANDLER_NAME_PATTERN.search(name) else "function"
+            name, is_handler = _node_name(source, node)
             start_line, end_line = _line_range(node)
             drafts.append(
                 _SymbolDraft(
-                    kind=kind,
+                    kind="handler" if is_handler else "function",
                     name=name,
                     start_line=start_line,
                     end_line=end_line,
@@ -134,8 +149,7 @@ class TreeSitterCodeParser:
             return
 
         if node_type == "class_definition":
-            name_node = node.child_by_field_name("name")
-            name = _node_text(source, name_node.start_byte, name_node.end_byte) if name_node else None
+            name, _ = _node_name(source, node)
             start_line, end_line = _line_range(node)
             drafts.append(
                 _SymbolDraft(
@@ -149,24 +163,24 @@ class TreeSitterCodeParser:
             return
 
         if node_type == "decorated_definition":
-            text = _node_text(source, node.start_byte, node.end_byte)
-            if _ROUTE_PATTERN.search(text) or "@app" in text:
+            snippet = source[node.start_byte : node.end_byte]
+            if _ROUTE_PATTERN.search(snippet) or _APP_DECORATOR_PATTERN.search(snippet):
                 start_line, end_line = _line_range(node)
-                name_match = re.search(r"def\s+([A-Za-z_][A-Za-z0-9_]*)", text)
+                name_match = _DEF_NAME_PATTERN.search(snippet)
                 drafts.append(
                     _SymbolDraft(
                         kind="route",
-                        name=name_match.group(1) if name_match else None,
+                        name=name_match.group(1).decode("utf-8", errors="ignore") if name_match else None,
                         start_line=start_line,
                         end_line=end_line,
-                        text=text,
+                        text=str(snippet, "utf-8", "ignore"),
                     )
                 )
             return
 
         if node_type == "call":
-            text = _node_text(source, node.start_byte, node.end_byte)
-            if _ROUTE_PATTERN.search(text) and _PATH_ARG_PATTERN.search(text):
+            snippet = source[node.start_byte : node.end_byte]
+            if _ROUTE_PATTERN.search(snippet) and _PATH_ARG_PATTERN.search(snippet):
                 start_line, end_line = _line_range(node)
                 drafts.append(
                     _SymbolDraft(
@@ -174,21 +188,19 @@ class TreeSitterCodeParser:
                         name=None,
                         start_line=start_line,
                         end_line=end_line,
-                        text=text,
+                        text=str(snippet, "utf-8", "ignore"),
                     )
                 )
 
-    def _collect_js_ts(self, node: object, source: bytes, drafts: list[_SymbolDraft]) -> None:
+    def _collect_js_ts(self, node: object, source: memoryview, drafts: list[_SymbolDraft]) -> None:
         node_type = node.type
 
         if node_type in {"function_declaration", "generator_function_declaration"}:
-            name_node = node.child_by_field_name("name")
-            name = _node_text(source, name_node.start_byte, name_node.end_byte) if name_node else None
-            kind = "handler" if name and _HANDLER_NAME_PATTERN.search(name) else "function"
+            name, is_handler = _node_name(source, node)
             start_line, end_line = _line_range(node)
             drafts.append(
                 _SymbolDraft(
-                    kind=kind,
+                    kind="handler" if is_handler else "function",
                     name=name,
                     start_line=start_line,
                     end_line=end_line,
@@ -198,8 +210,7 @@ class TreeSitterCodeParser:
             return
 
         if node_type == "class_declaration":
-            name_node = node.child_by_field_name("name")
-            name = _node_text(source, name_node.start_byte, name_node.end_byte) if name_node else None
+            name, _ = _node_name(source, node)
             start_line, end_line = _line_range(node)
             drafts.append(
                 _SymbolDraft(
@@ -213,12 +224,11 @@ class TreeSitterCodeParser:
             return
 
         if node_type == "method_definition":
-            name_node = node.child_by_field_name("name")
-            name = _node_text(source, name_node.start_byte, name_node.end_byte) if name_node else None
+            name, is_handler = _node_name(source, node)
             start_line, end_line = _line_range(node)
             drafts.append(
                 _SymbolDraft(
-                    kind="handler" if name and _HANDLER_NAME_PATTERN.search(name) else "function",
+                    kind="handler" if is_handler else "function",
                     name=name,
                     start_line=start_line,
                     end_line=end_line,
@@ -234,12 +244,11 @@ class TreeSitterCodeParser:
                 "function",
                 "function_expression",
             }:
-                name_node = node.child_by_field_name("name")
-                name = _node_text(source, name_node.start_byte, name_node.end_byte) if name_node else None
+                name, is_handler = _node_name(source, node)
                 start_line, end_line = _line_range(node)
                 drafts.append(
                     _SymbolDraft(
-                        kind="handler" if name and _HANDLER_NAME_PATTERN.search(name) else "function",
+                        kind="handler" if is_handler else "function",
                         name=name,
                         start_line=start_line,
                         end_line=end_line,
@@ -249,22 +258,28 @@ class TreeSitterCodeParser:
             return
 
         if node_type == "call_expression":
-            text = _node_text(source, node.start_byte, node.end_byte)
-            if _ROUTE_PATTERN.search(text) and _PATH_ARG_PATTERN.search(text):
+            snippet = source[node.start_byte : node.end_byte]
+            if _ROUTE_PATTERN.search(snippet) and _PATH_ARG_PATTERN.search(snippet):
                 start_line, end_line = _line_range(node)
-                route_name = self._extract_route_name(text)
+                text = str(snippet, "utf-8", "ignore")
                 drafts.append(
                     _SymbolDraft(
                         kind="route",
-                        name=route_name,
+                        name=self._extract_route_name(text),
                         start_line=start_line,
                         end_line=end_line,
                         text=text,
                     )
                 )
 
-    def _add_major_blocks(self, root: object, source: bytes, drafts: list[_SymbolDraft]) -> None:
-        occupied: list[tuple[int, int]] = [(draft.start_line, draft.end_line) for draft in drafts]
+    def _add_major_blocks(self, root: object, source: memoryview, drafts: list[_SymbolDraft]) -> None:
+        # Draft spans sorted by start with a running max of ends: a span is covered by some
+        # draft iff the max end among drafts starting at or before it reaches its end.
+        occupied = sorted((draft.start_line, draft.end_line) for draft in drafts)
+        occupied_starts = [start for start, _ in occupied]
+        occupied_max_ends = list(accumulate((end for _, end in occupied), max))
+        # Major blocks are appended in sibling order, so a running max covers them too.
+        blocks_max_end = 0
         for child in root.children:
             if not child.is_named:
                 continue
@@ -281,7 +296,10 @@ class TreeSitterCodeParser:
             span = end_line - start_line + 1
             if span < 15:
                 continue
-            if any(start_line >= s and end_line <= e for s, e in occupied):
+            idx = bisect_right(occupied_starts, start_line) - 1
+            if idx >= 0 and occupied_max_ends[idx] >= end_line:
+                continue
+            if blocks_max_end >= end_line:
                 continue
             drafts.append(
                 _SymbolDraft(
@@ -292,7 +310,7 @@ class TreeSitterCodeParser:
                     text=_node_text(source, child.start_byte, child.end_byte),
                 )
             )
-            occupied.append((start_line, end_line))
+            blocks_max_end = max(blocks_max_end, end_line)
 
     @staticmethod
     def _extract_route_name(text: str) -> str | None:
@@ -56,11 +56,15 @@ class QueryEngine:
         chunk_ids = [hit.chunk_id for hit in hits]
         chunks = self.metadata_store.get_chunks_by_ids(chunk_ids)
 
+        found = [(hit, chunks[hit.chunk_id]) for hit in hits if hit.chunk_id in chunks]
+        decisions = (
+            self.ranking_heuristics.evaluate_batch(query_for_search, [chunk for _, chunk in found])
+            if self.ranking_heuristics is not None
+            else None
+        )
+
         matches: list[QueryMatch] = []
-        for hit in hits:
-            chunk = chunks.get(hit.chunk_id)
-            if chunk is None:
-                continue
+        for idx, (hit, chunk) in enumerate(found):
             (
                 total,
                 normalized_vector,
@@ -75,26 +79,18 @@ class QueryEngine:
                 symbol_terms=chunk.symbol_terms,
                 route_intent=chunk.route_intent,
                 route_method=chunk.route_method,
-                route_resource=chunk.route_resource,
                 structural_terms=chunk.structural_terms,
             )
             matched_intents: list[str] = []
             matched_keywords: list[str] = []
-            explanation_bits = [
-                f"semantic={normalized_vector:.3f}",
-                f"keyword={keyword_score:.3f}",
-                f"symbol={symbol_score:.3f}",
-                f"intent={intent_score:.3f}",
-                f"structural={structural_score:.3f}",
-            ]
+            heuristic_reasons: list[str] = []
             adjusted_total = total
-            if self.ranking_heuristics is not None:
-                decision = self.ranking_heuristics.evaluate(query_for_search, chunk)
+            if decisions is not None:
+                decision = decisions[idx]
                 adjusted_total = total * decision.multiplier
                 matched_intents = decision.matched_intents
                 matched_keywords = decision.matched_keywords
-                if decision.reasons:
-                    explanation_bits.append("heuristics=" + ", ".join(decision.reasons))
+                heuristic_reasons = decision.reasons
 
             matches.append(
                 QueryMatch(
@@ -107,19 +103,17 @@ class QueryEngine:
                     structural_score=structural_score,
                     matched_intents=matched_intents,
                     matched_keywords=matched_keywords,
-                    explanation="; ".join(explanation_bits),
+                    heuristic_reasons=heuristic_reasons,
                 )
             )
 
-        matches.sort(
-            key=lambda item: (
-                item.score,
-                item.vector_score,
-                1 if item.chunk.symbol else 0,
-                -item.chunk.tokens,
-            ),
-            reverse=True,
-        )
+        # Decorate-sort-undecorate; the negated index keeps ties in hit order under reverse=True.
+        ranking = [
+            (item.score, item.vector_score, 1 if item.chunk.symbol else 0, -item.chunk.tokens, -idx)
+            for idx, item in enumerate(matches)
+        ]
+        ranking.sort(reverse=True)
+        matches = [matches[-key[-1]] for key in ranking]
         if self.local_reranker is not None and matches:
             reranked, _, _ = self.local_reranker.rerank(query_for_search, matches[:10])
             if len(matches) > 10:
@@ -143,7 +137,9 @@ class QueryEngine:
                     source="vector",
                 )
             else:
-                decision = self.reranker.decide(query_for_search, matches)
+                decision = self.reranker.decide(
+                    query_for_search, matches, query_embedding=query_embedding
+                )
                 if decision is not None:
                     selection = decision.selection
                     used_gemini = decision.used_gemini
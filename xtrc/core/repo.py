@@ -37,7 +37,11 @@ class IgnoreMatcher:
     def matches(self, candidate: Path, is_dir: bool) -> bool:
         if self.spec is None:
             return False
-        rel = candidate.relative_to(self.repo_path).as_posix()
+        return self.matches_relative(candidate.relative_to(self.repo_path).as_posix(), is_dir)
+
+    def matches_relative(self, rel: str, is_dir: bool) -> bool:
+        if self.spec is None:
+            return False
         if not rel or rel == ".":
             return False
         if self.spec.match_file(rel):
@@ -55,27 +59,45 @@ def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+def _detect_language_for_name(name: str) -> str | None:
+    _, dot, ext = name.rpartition(".")
+    if not dot:
+        return None
+    return SUPPORTED_EXTENSIONS.get(f".{ext.lower()}")
+
+
 def walk_source_files(repo_path: Path) -> list[Path]:
     ignore_matcher = IgnoreMatcher.from_repo(repo_path)
     files: list[Path] = []
-    for root, dirs, filenames in os.walk(repo_path):
-        root_path = Path(root)
-        retained_dirs: list[str] = []
-        for dirname in dirs:
-            if dirname in IGNORED_DIRS or dirname.startswith("."):
+
+    def _scan(root: str, rel_prefix: str) -> None:
+        try:
+            with os.scandir(root) as entries:
+                entry_list = list(entries)
+        except OSError:
+            return
+
+        subdirs: list[tuple[str, str]] = []
+        for entry in entry_list:
+            name = entry.name
+            if name.startswith("."):
                 continue
-            dir_path = root_path / dirname
-            if ignore_matcher.matches(dir_path, is_dir=True):
+            rel = f"{rel_prefix}{name}"
+            if entry.is_dir(follow_symlinks=False):
+                if name in IGNORED_DIRS or ignore_matcher.matches_relative(rel, is_dir=True):
+                    continue
+                subdirs.append((entry.path, f"{rel}/"))
                 continue
-            retained_dirs.append(dirname)
-        dirs[:] = retained_dirs
 
-        for name in filenames:
-            if name in IGNORED_FILES or name.startswith("."):
+            if name in IGNORED_FILES or _detect_language_for_name(name) is None:
                 continue
-            file_path = root_path / name
-            if ignore_matcher.matches(file_path, is_dir=False):
+            if ignore_matcher.matches_relative(rel, is_dir=False) or not entry.is_file():
                 continue
-            if detect_language(file_path) is not None:
-                files.append(file_path)
+            files.append(Path(entry.path))
+
+        # Match os.walk's top-down order: a directory's files before its subdirectories.
+        for subdir_path, subdir_rel in subdirs:
+            _scan(subdir_path, subdir_rel)
+
+    _scan(str(repo_path), "")
     return files
@@ -20,25 +20,32 @@ _INTENT_ALIASES: dict[str, set[str]] = {
     "read": {"read", "get", "fetch", "find", "list", "show", "retrieve"},
 }
 
-_STOP_TERMS = {
-    "the",
-    "this",
-    "that",
-    "with",
-    "from",
-    "into",
-    "where",
-    "when",
-    "which",
-    "what",
-    "does",
-    "should",
-    "route",
-    "endpoint",
-    "http",
-    "api",
-    "resource",
+_ALIAS_TO_INTENT: dict[str, str] = {
+    alias: intent for intent, aliases in _INTENT_ALIASES.items() for alias in aliases
 }
+_HTTP_METHODS: frozenset[str] = frozenset(HTTP_INTENT_MAP)
+
+_STOP_TERMS = frozenset(
+    {
+        "the",
+        "this",
+        "that",
+        "with",
+        "from",
+        "into",
+        "where",
+        "when",
+        "which",
+        "what",
+        "does",
+        "should",
+        "route",
+        "endpoint",
+        "http",
+        "api",
+        "resource",
+    }
+)
 
 _JS_ROUTE_RE = re.compile(r"\.\s*(get|post|put|delete|patch)\s*\(\s*['\"]([^'\"]+)['\"]", re.IGNORECASE)
 _PY_DECORATOR_ROUTE_RE = re.compile(
@@ -117,17 +124,9 @@ def extract_route_signal(text: str, symbol_name: str | None = None) -> RouteSign
 
 def infer_query_signal(query: str) -> QuerySignal:
     terms = normalize_terms(query)
-    methods = {term for term in terms if term in HTTP_INTENT_MAP}
-
-    intents: set[str] = set()
-    for intent, aliases in _INTENT_ALIASES.items():
-        if any(term in aliases for term in terms):
-            intents.add(intent)
-
-    for method in methods:
-        mapped = HTTP_INTENT_MAP.get(method)
-        if mapped:
-            intents.add(mapped)
+    methods = _HTTP_METHODS.intersection(terms)
+    intents = {_ALIAS_TO_INTENT[term] for term in terms if term in _ALIAS_TO_INTENT}
+    intents.update(HTTP_INTENT_MAP[method] for method in methods)
 
     structural = {term for term in terms if term not in _STOP_TERMS}
     structural.update(methods)
@@ -3,6 +3,8 @@ from __future__ import annotations
 import hashlib
 import uuid
 from dataclasses import dataclass
+from functools import cache, lru_cache
+from operator import attrgetter
 from pathlib import Path
 
 import numpy as np
@@ -12,6 +14,53 @@ from qdrant_client.http import models
 from xtrc.core.errors import AinavError
 from xtrc.core.models import CodeChunk
 
+# Chunk fields mirrored into each point payload; attrgetter pulls them in a single C call.
+_PAYLOAD_FIELDS = (
+    "chunk_id",
+    "repo_path",
+    "file_path",
+    "language",
+    "start_line",
+    "end_line",
+    "symbol",
+    "symbol_kind",
+    "description",
+    "keywords",
+    "symbol_terms",
+    "route_method",
+    "route_path",
+    "route_intent",
+    "route_resource",
+    "intent_tags",
+    "structural_terms",
+)
+_payload_values = attrgetter(*_PAYLOAD_FIELDS)
+
+# int8 copies of the vectors are kept in RAM for HNSW traversal; the top candidates are then
+# rescored against the full-precision vectors so recall is preserved.
+_QUANTIZATION_CONFIG = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(
+        type=models.ScalarType.INT8,
+        quantile=0.99,
+        always_ram=True,
+    )
+)
+_QUANTIZED_SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
+
+@cache
+def _collection_name(repo_path: str) -> str:
+    digest = hashlib.sha1(repo_path.encode("utf-8")).hexdigest()[:20]
+    return f"ainav_{digest}"
+
+
+@lru_cache(maxsize=4096)
+def _point_id(chunk_id: str) -> str:
+    # Local Qdrant enforces UUID/int ids, so map stable chunk hashes to UUIDs.
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, chunk_id))
+
 
 @dataclass(frozen=True)
 class SearchHit:
@@ -21,45 +70,77 @@ class SearchHit:
 
 
 class QdrantVectorStore:
-    def __init__(self, qdrant_path: Path) -> None:
-        qdrant_path.mkdir(parents=True, exist_ok=True)
-        self.client = QdrantClient(path=str(qdrant_path))
+    UPLOAD_BATCH_SIZE = 64
+
+    def __init__(
+        self,
+        qdrant_path: Path,
+        grpc_url: str | None = None,
+        *,
+        normalize_at_ingest: bool = True,
+        quantize: bool = True,
+    ) -> None:
+        self.grpc_url = grpc_url
+        # Embedded (path) mode always does exact search and ignores quantization, so it only
+        # applies to a remote server.
+        self.quantize = quantize and bool(grpc_url)
+        self._search_params = _QUANTIZED_SEARCH_PARAMS if self.quantize else None
+        # With unit-length vectors, dot product equals cosine similarity, so new collections use
+        # DOT and Qdrant skips re-normalizing on every comparison. Existing COSINE collections
+        # keep working unchanged since both score unit vectors identically.
+        self.normalize_at_ingest = normalize_at_ingest
+        self._distance = models.Distance.DOT if normalize_at_ingest else models.Distance.COSINE
+        if grpc_url:
+            self.client = QdrantClient(url=grpc_url, prefer_grpc=True)
+        else:
+            qdrant_path.mkdir(parents=True, exist_ok=True)
+            self.client = QdrantClient(path=str(qdrant_path))
+        # Vector sizes of collections this store has created or verified, so repeated upserts
+        # and searches skip the exists/get_collection round trips.
+        self._known_sizes: dict[str, int] = {}
 
     @staticmethod
     def collection_name(repo_path: str) -> str:
-        digest = hashlib.sha1(repo_path.encode("utf-8")).hexdigest()[:20]
-        return f"ainav_{digest}"
+        return _collection_name(repo_path)
 
     @staticmethod
     def point_id(chunk_id: str) -> str:
-        # Local Qdrant enforces UUID/int ids, so map stable chunk hashes to UUIDs.
-        return str(uuid.uuid5(uuid.NAMESPACE_URL, chunk_id))
+        return _point_id(chunk_id)
 
     def ensure_collection(self, repo_path: str, vector_size: int, recreate: bool = False) -> bool:
         collection = self.collection_name(repo_path)
+        if not recreate and self._known_sizes.get(collection) == vector_size:
+            return False
+
         exists = self.client.collection_exists(collection_name=collection)
         recreated = False
         if recreate and exists:
-            self.client.delete_collection(collection_name=collection)
+            self._delete_collection(collection)
             exists = False
             recreated = True
 
         if exists and not recreate:
             existing_size = self._collection_vector_size(collection)
             if existing_size is not None and existing_size != vector_size:
-                self.client.delete_collection(collection_name=collection)
+                self._delete_collection(collection)
                 exists = False
                 recreated = True
 
         if not exists:
             self.client.create_collection(
                 collection_name=collection,
-                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+                vectors_config=models.VectorParams(size=vector_size, distance=self._distance),
+                quantization_config=_QUANTIZATION_CONFIG if self.quantize else None,
             )
             recreated = True
 
+        self._known_sizes[collection] = vector_size
         return recreated
 
+    def _delete_collection(self, collection_name: str) -> None:
+        self._known_sizes.pop(collection_name, None)
+        self.client.delete_collection(collection_name=collection_name)
+
     def _collection_vector_size(self, collection_name: str) -> int | None:
         info = self.client.get_collection(collection_name=collection_name)
         config = getattr(info, "config", None)
@@ -86,39 +167,36 @@ class QdrantVectorStore:
     def upsert_chunks(self, repo_path: str, chunks: list[CodeChunk], vectors: np.ndarray) -> None:
         if not chunks:
             return
+        if len(chunks) != vectors.shape[0]:
+            raise ValueError(
+                f"Got {len(chunks)} chunks but {vectors.shape[0]} vectors; they must align 1:1"
+            )
         collection = self.collection_name(repo_path)
         self.ensure_collection(repo_path, int(vectors.shape[1]))
 
-        points: list[models.PointStruct] = []
-        for chunk, vector in zip(chunks, vectors, strict=True):
-            payload: dict[str, object] = {
-                "chunk_id": chunk.chunk_id,
-                "repo_path": chunk.repo_path,
-                "file_path": chunk.file_path,
-                "language": chunk.language,
-                "start_line": chunk.start_line,
-                "end_line": chunk.end_line,
-                "symbol": chunk.symbol,
-                "symbol_kind": chunk.symbol_kind,
-                "description": chunk.description,
-                "keywords": chunk.keywords,
-                "symbol_terms": chunk.symbol_terms,
-                "route_method": chunk.route_method,
-                "route_path": chunk.route_path,
-                "route_intent": chunk.route_intent,
-                "route_resource": chunk.route_resource,
-                "intent_tags": chunk.intent_tags,
-                "structural_terms": chunk.structural_terms,
-            }
-            points.append(
-                models.PointStruct(
-                    id=self.point_id(chunk.chunk_id),
-                    vector=vector.astype(np.float32).tolist(),
-                    payload=payload,
-                )
-            )
+        # Parallel id/vector/payload columns instead of one validated PointStruct per chunk.
+        matrix = self._prepare_matrix(vectors)
+        point_ids = [_point_id(chunk.chunk_id) for chunk in chunks]
+        payloads: list[dict[str, object]] = [
+            dict(zip(_PAYLOAD_FIELDS, _payload_values(chunk))) for chunk in chunks
+        ]
 
-        self.client.upsert(collection_name=collection, points=points, wait=True)
+        if self.grpc_url:
+            # Remote server: stream batches over gRPC without blocking on each segment apply.
+            self.client.upload_collection(
+                collection_name=collection,
+                vectors=matrix,
+                payload=payloads,
+                ids=point_ids,
+                batch_size=self.UPLOAD_BATCH_SIZE,
+                wait=False,
+            )
+            return
+        self.client.upsert(
+            collection_name=collection,
+            points=models.Batch(ids=point_ids, vectors=matrix.tolist(), payloads=payloads),
+            wait=True,
+        )
 
     def delete_chunk_ids(self, repo_path: str, chunk_ids: list[str]) -> None:
         if not chunk_ids:
@@ -126,7 +204,7 @@ class QdrantVectorStore:
         collection = self.collection_name(repo_path)
         if not self.client.collection_exists(collection_name=collection):
             return
-        point_ids = [self.point_id(chunk_id) for chunk_id in chunk_ids]
+        point_ids = [_point_id(chunk_id) for chunk_id in chunk_ids]
         self.client.delete(
             collection_name=collection,
             points_selector=models.PointIdsList(points=point_ids),
@@ -156,21 +234,9 @@ class QdrantVectorStore:
         if not self.client.collection_exists(collection_name=collection):
             return []
 
-        expected_size = int(query_vector.shape[0])
-        existing_size = self._collection_vector_size(collection)
-        if existing_size is not None and existing_size != expected_size:
-            raise AinavError(
-                code="INDEX_DIMENSION_MISMATCH",
-                message=(
-                    "Indexed vectors are incompatible with current embedding model "
-                    f"(index_dim={existing_size}, model_dim={expected_size}). "
-                    "Run `xtrc index <repo> --rebuild`."
-                ),
-                status_code=409,
-                details={"index_dim": existing_size, "model_dim": expected_size},
-            )
+        self._check_query_dimension(collection, int(query_vector.shape[0]))
 
-        vector = query_vector.astype(np.float32).tolist()
+        vector = self._prepare_matrix(query_vector[np.newaxis, :])[0].tolist()
         try:
             if hasattr(self.client, "search"):
                 points = self.client.search(
@@ -178,6 +244,7 @@ class QdrantVectorStore:
                     query_vector=vector,
                     limit=limit,
                     with_payload=True,
+                    search_params=self._search_params,
                 )
             elif hasattr(self.client, "query_points"):
                 response = self.client.query_points(
@@ -186,21 +253,108 @@ class QdrantVectorStore:
                     limit=limit,
                     with_payload=True,
                     with_vectors=False,
+                    search_params=self._search_params,
                 )
                 points = getattr(response, "points", response)
             else:
                 raise RuntimeError("Unsupported qdrant-client version: missing search/query_points")
         except ValueError as exc:
-            # Older local qdrant versions may throw raw shape mismatch errors here.
+            raise self._dimension_mismatch_error() from exc
+
+        return self._to_hits(points)
+
+    def search_many(
+        self,
+        repo_path: str,
+        query_vectors: np.ndarray,
+        limit: int,
+    ) -> list[list[SearchHit]]:
+        if len(query_vectors) == 0:
+            return []
+        collection = self.collection_name(repo_path)
+        if not self.client.collection_exists(collection_name=collection):
+            return [[] for _ in range(len(query_vectors))]
+
+        matrix = self._prepare_matrix(query_vectors)
+        self._check_query_dimension(collection, int(matrix.shape[1]))
+
+        # One batched request instead of a round trip per query vector.
+        vectors = matrix.tolist()
+        try:
+            if hasattr(self.client, "search_batch"):
+                results = self.client.search_batch(
+                    collection_name=collection,
+                    requests=[
+                        models.SearchRequest(
+                            vector=vector,
+                            limit=limit,
+                            with_payload=True,
+                            params=self._search_params,
+                        )
+                        for vector in vectors
+                    ],
+                )
+            elif hasattr(self.client, "query_batch_points"):
+                responses = self.client.query_batch_points(
+                    collection_name=collection,
+                    requests=[
+                        models.QueryRequest(
+                            query=vector,
+                            limit=limit,
+                            with_payload=True,
+                            with_vector=False,
+                            params=self._search_params,
+                        )
+                        for vector in vectors
+                    ],
+                )
+                results = [getattr(response, "points", response) for response in responses]
+            else:
+                raise RuntimeError(
+                    "Unsupported qdrant-client version: missing search_batch/query_batch_points"
+                )
+        except ValueError as exc:
+            raise self._dimension_mismatch_error() from exc
+
+        return [self._to_hits(points) for points in results]
+
+    def _prepare_matrix(self, vectors: np.ndarray) -> np.ndarray:
+        matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        if not self.normalize_at_ingest:
+            return matrix
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+    def _check_query_dimension(self, collection: str, expected_size: int) -> None:
+        existing_size = self._known_sizes.get(collection)
+        if existing_size is None:
+            existing_size = self._collection_vector_size(collection)
+        if existing_size is not None and existing_size != expected_size:
             raise AinavError(
                 code="INDEX_DIMENSION_MISMATCH",
                 message=(
-                    "Indexed vectors are incompatible with current embedding model. "
+                    "Indexed vectors are incompatible with current embedding model "
+                    f"(index_dim={existing_size}, model_dim={expected_size}). "
                     "Run `xtrc index <repo> --rebuild`."
                 ),
                 status_code=409,
-            ) from exc
+                details={"index_dim": existing_size, "model_dim": expected_size},
+            )
 
+    @staticmethod
+    def _dimension_mismatch_error() -> AinavError:
+        # Older local qdrant versions may throw raw shape mismatch errors instead.
+        return AinavError(
+            code="INDEX_DIMENSION_MISMATCH",
+            message=(
+                "Indexed vectors are incompatible with current embedding model. "
+                "Run `xtrc index <repo> --rebuild`."
+            ),
+            status_code=409,
+        )
+
+    @staticmethod
+    def _to_hits(points: list[object]) -> list[SearchHit]:
         hits: list[SearchHit] = []
         for point in points:
             payload = dict(point.payload or {})
@@ -1,33 +1,39 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
 from xtrc.core.route_signals import extract_route_signal
 from xtrc.core.tokenizer import normalize_terms
 
-_NOISE_PATH_HINTS = {
-    "seed",
-    "seeds",
-    "migration",
-    "migrations",
-    "fixture",
-    "fixtures",
-    "dummy",
-    "mock",
-    "test",
-    "tests",
-    "spec",
-    "script",
-    "scripts",
-}
-
-_LOGGING_HINTS = {"log", "logger", "logging", "audit", "trace"}
-_ANALYTICS_HINTS = {"analytics", "metric", "metrics", "telemetry", "tracking", "event"}
-
-_CREATE_HINTS = {"create", "insert", "add", "register", "new", "post"}
-_UPDATE_HINTS = {"update", "modify", "edit", "patch", "put", "upsert"}
-_DELETE_HINTS = {"delete", "remove", "destroy", "drop"}
-_READ_HINTS = {"get", "fetch", "read", "list", "find", "retrieve", "query"}
+_NOISE_PATH_HINTS = frozenset(
+    {
+        "seed",
+        "seeds",
+        "migration",
+        "migrations",
+        "fixture",
+        "fixtures",
+        "dummy",
+        "mock",
+        "test",
+        "tests",
+        "spec",
+        "script",
+        "scripts",
+    }
+)
+_FIXTURE_HINTS = frozenset({"fixture", "fixtures", "mock"})
+_TEST_PATH_HINTS = frozenset({"test", "tests", "spec"})
+_SCRIPT_PATH_HINTS = frozenset({"script", "scripts"})
+
+_LOGGING_HINTS = frozenset({"log", "logger", "logging", "audit", "trace"})
+_ANALYTICS_HINTS = frozenset({"analytics", "metric", "metrics", "telemetry", "tracking", "event"})
+
+_CREATE_HINTS = frozenset({"create", "insert", "add", "register", "new", "post"})
+_UPDATE_HINTS = frozenset({"update", "modify", "edit", "patch", "put", "upsert"})
+_DELETE_HINTS = frozenset({"delete", "remove", "destroy", "drop"})
+_READ_HINTS = frozenset({"get", "fetch", "read", "list", "find", "retrieve", "query"})
 
 
 @dataclass(frozen=True)
@@ -48,7 +54,10 @@ def extract_intent_metadata(
     symbol: str | None,
     text: str,
 ) -> IntentMetadata:
-    terms = set(normalize_terms(f"{file_path}\n{symbol or ''}\n{text[:8000]}"))
+    # Tokens never span newlines, so the path terms can be cached and unioned in separately.
+    terms = set(normalize_terms(f"{symbol or ''}\n{text[:8000]}"))
+    terms.update(_path_terms(file_path))
+    path_low = file_path.lower()
 
     route_signal = extract_route_signal(text, symbol_name=symbol)
     route_method = route_signal.method if route_signal is not None else None
@@ -56,38 +65,40 @@ def extract_intent_metadata(
     route_intent = route_signal.intent if route_signal is not None else None
     route_resource = route_signal.resource if route_signal is not None else None
 
-    tags: set[str] = set()
+    tags: list[str] = []
     if route_intent:
-        tags.add(f"{route_intent}_resource")
-
-    if _has_any(file_path, _NOISE_PATH_HINTS) or _has_any_set(terms, {"fixture", "fixtures", "mock"}):
-        if "seed" in file_path or "seeds" in file_path:
-            tags.add("seed_data")
-        if "migration" in file_path or "migrations" in file_path:
-            tags.add("migration_script")
-        if _has_any(file_path, {"test", "tests", "spec"}):
-            tags.add("test_script")
-        if _has_any(file_path, {"script", "scripts"}):
-            tags.add("script")
+        tags.append(f"{route_intent}_resource")
+
+    if _has_any(path_low, _NOISE_PATH_HINTS) or _has_any_set(terms, _FIXTURE_HINTS):
+        # "seed"/"migration" also cover their plural forms.
+        if "seed" in file_path:
+            tags.append("seed_data")
+        if "migration" in file_path:
+            tags.append("migration_script")
+        if _has_any(path_low, _TEST_PATH_HINTS):
+            tags.append("test_script")
+        if _has_any(path_low, _SCRIPT_PATH_HINTS):
+            tags.append("script")
 
     if _has_any_set(terms, _LOGGING_HINTS):
-        tags.add("logging")
+        tags.append("logging")
     if _has_any_set(terms, _ANALYTICS_HINTS):
-        tags.add("analytics")
+        tags.append("analytics")
 
     if _has_any_set(terms, _CREATE_HINTS):
-        tags.add("create_resource")
+        tags.append("create_resource")
     if _has_any_set(terms, _UPDATE_HINTS):
-        tags.add("update_resource")
+        tags.append("update_resource")
     if _has_any_set(terms, _DELETE_HINTS):
-        tags.add("delete_resource")
+        tags.append("delete_resource")
     if _has_any_set(terms, _READ_HINTS):
-        tags.add("read_resource")
+        tags.append("read_resource")
 
     if route_signal is not None:
-        tags.add("route_handler")
+        tags.append("route_handler")
 
-    structural_terms = set(terms)
+    # terms is not read again, so the route terms are folded in without copying it.
+    structural_terms = terms
     if route_signal is not None:
         structural_terms.update(route_signal.structural_terms)
         structural_terms.add(route_signal.method.lower())
@@ -98,20 +109,27 @@ def extract_intent_metadata(
     is_route_handler = route_signal is not None or (symbol_kind == "route")
 
     return IntentMetadata(
-        intent_tags=sorted(tags),
+        # Tags keep their (deterministic) detection order; duplicates only arise from the route
+        # intent repeating a hint-based tag.
+        intent_tags=list(dict.fromkeys(tags)),
         route_method=route_method,
         route_path=route_path,
         route_intent=route_intent,
         route_resource=route_resource,
-        structural_terms=sorted(structural_terms),
+        # ChunkBuilder merges these with path terms and sorts the result itself.
+        structural_terms=list(structural_terms),
         is_route_handler=is_route_handler,
     )
 
 
-def _has_any(value: str, candidates: set[str]) -> bool:
-    low = value.lower()
-    return any(candidate in low for candidate in candidates)
+@lru_cache(maxsize=1024)
+def _path_terms(file_path: str) -> frozenset[str]:
+    return frozenset(normalize_terms(file_path))
 
 
-def _has_any_set(values: set[str], candidates: set[str]) -> bool:
-    return bool(values.intersection(candidates))
+def _has_any(value_low: str, candidates: frozenset[str]) -> bool:
+    return any(candidate in value_low for candidate in candidates)
+
+
+def _has_any_set(values: set[str], candidates: frozenset[str]) -> bool:
+    return not values.isdisjoint(candidates)
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import replace
 
 from xtrc.core.metadata_store import MetadataStore
@@ -39,23 +42,39 @@ class IndexChunkSummarizer:
         llm_client: LLMTextClient | None,
         model_name: str,
         max_chars: int = 400,
+        max_workers: int | None = None,
+        memory_cache_size: int = 4096,
     ) -> None:
         self.metadata_store = metadata_store
         self.llm_client = llm_client
         self.model_name = model_name
         self.max_chars = max(80, max_chars)
+        # Calls are I/O-bound and the client enforces its deadline per request, so the pool can
+        # run wider than the CPU count.
+        if max_workers is None:
+            max_workers = max(8, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="xtrc-summary",
+        )
+        # Recently used summaries, bounded because the daemon keeps summarizers for its lifetime.
+        self.memory_cache_size = max(1, memory_cache_size)
+        self._memory_cache: OrderedDict[str, str] = OrderedDict()
 
     def summarize_chunks(self, chunks: list[CodeChunk]) -> tuple[dict[str, str], int]:
         if not chunks:
             return {}, 0
 
         keys = {chunk.chunk_id: self._summary_key(chunk) for chunk in chunks}
-        cached = self.metadata_store.get_cached_chunk_summaries(list(keys.values()))
+        cached = self._cached_summaries(list(keys.values()))
 
         summaries: dict[str, str] = {}
         to_store: dict[str, str] = {}
         latency_ms = 0
 
+        # Submit every cache miss up front and collect in chunk order so the calls overlap.
+        # Summary keys are per chunk, so duplicated code is coalesced on the rendered prompt.
+        pending: dict[str, tuple[list[tuple[CodeChunk, str]], Future[tuple[str, int]]]] = {}
         for chunk in chunks:
             key = keys[chunk.chunk_id]
             cached_summary = cached.get(key)
@@ -75,17 +94,29 @@ class IndexChunkSummarizer:
                 intent_tags=", ".join(chunk.intent_tags) or "none",
                 code=self._truncate_code(chunk.text),
             )
+            group = pending.get(prompt)
+            if group is not None:
+                group[0].append((chunk, key))
+                continue
+            future = self._executor.submit(
+                self.llm_client.complete_text, prompt, model_name=self.model_name
+            )
+            pending[prompt] = ([(chunk, key)], future)
+
+        for members, future in pending.values():
             try:
-                text, elapsed = self.llm_client.complete_text(prompt, model_name=self.model_name)
+                text, elapsed = future.result()
             except LLMClientError as exc:
-                logger.warning("Chunk summarization failed for %s: %s", chunk.chunk_id, exc)
+                logger.warning("Chunk summarization failed for %s: %s", members[0][0].chunk_id, exc)
                 continue
 
             clean = self._clean_summary(text)
             if not clean:
                 continue
-            summaries[chunk.chunk_id] = clean
-            to_store[key] = clean
+            for chunk, key in members:
+                summaries[chunk.chunk_id] = clean
+                to_store[key] = clean
+                self._remember_summary(key, clean)
             latency_ms += elapsed
 
         if to_store:
@@ -93,6 +124,31 @@ class IndexChunkSummarizer:
 
         return summaries, latency_ms
 
+    def _cached_summaries(self, keys: list[str]) -> dict[str, str]:
+        # Resolve the whole batch into a local dict first so evictions while filling the memory
+        # cache cannot drop summaries this batch still needs.
+        found: dict[str, str] = {}
+        missing_keys: list[str] = []
+        for key in keys:
+            summary = self._memory_cache.get(key)
+            if summary is None:
+                missing_keys.append(key)
+            else:
+                self._memory_cache.move_to_end(key)
+                found[key] = summary
+        if missing_keys:
+            stored = self.metadata_store.get_cached_chunk_summaries(missing_keys)
+            for key, summary in stored.items():
+                found[key] = summary
+                self._remember_summary(key, summary)
+        return found
+
+    def _remember_summary(self, key: str, summary: str) -> None:
+        self._memory_cache[key] = summary
+        self._memory_cache.move_to_end(key)
+        if len(self._memory_cache) > self.memory_cache_size:
+            self._memory_cache.popitem(last=False)
+
     @staticmethod
     def apply_summaries(chunks: list[CodeChunk], summaries: dict[str, str]) -> list[CodeChunk]:
         if not summaries:
@@ -125,8 +181,9 @@ class IndexChunkSummarizer:
         return "\n".join(parts).strip()
 
     def _summary_key(self, chunk: CodeChunk) -> str:
-        material = f"{self.model_name}|{chunk.chunk_id}|{chunk.content_hash}|{chunk.text}"
-        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+        # chunk_id is already a digest over the chunk path, span and text.
+        material = f"{self.model_name}|{chunk.chunk_id}|{chunk.content_hash}"
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
 
     @staticmethod
     def _truncate_code(text: str, max_chars: int = 2600) -> str:
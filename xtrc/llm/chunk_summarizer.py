@@ -2,6 +2,9 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import replace
 
 from xtrc.core.metadata_store import MetadataStore
@@ -37,29 +40,49 @@ class GeminiChunkSummarizer:
         *,
         model_name: str,
         max_chars: int = 320,
+        max_workers: int | None = None,
+        memory_cache_size: int = 4096,
     ) -> None:
         self.metadata_store = metadata_store
         self.client = client
         self.model_name = model_name
         self.max_chars = max(64, max_chars)
+        # Calls are I/O-bound and the client enforces its deadline per request, so the pool can
+        # run wider than the CPU count.
+        if max_workers is None:
+            max_workers = max(8, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="xtrc-gemini-summary",
+        )
+        # LRU of recent summaries; the SQLite cache behind it is the durable copy.
+        self.memory_cache_size = max(1, memory_cache_size)
+        self._memory_cache: OrderedDict[str, str] = OrderedDict()
 
     def summarize_chunks(self, chunks: list[CodeChunk]) -> tuple[dict[str, str], int]:
         if not chunks:
             return {}, 0
 
         key_by_chunk_id = {chunk.chunk_id: self._summary_key(chunk) for chunk in chunks}
-        cached = self.metadata_store.get_cached_chunk_summaries(list(key_by_chunk_id.values()))
+        cached = self._cached_summaries(list(key_by_chunk_id.values()))
 
         summaries_by_chunk_id: dict[str, str] = {}
         to_persist: dict[str, str] = {}
         total_latency_ms = 0
 
+        # Submit every cache miss up front and collect in chunk order so the calls overlap.
+        # Chunks sharing a summary key (duplicated code) ride on a single call.
+        pending: dict[str, tuple[list[CodeChunk], Future[tuple[str, int]]]] = {}
         for chunk in chunks:
             summary_key = key_by_chunk_id[chunk.chunk_id]
             cached_summary = cached.get(summary_key)
             if cached_summary:
                 summaries_by_chunk_id[chunk.chunk_id] = cached_summary
                 continue
+            group = pending.get(summary_key)
+            if group is not None:
+                group[0].append(chunk)
+                continue
 
             prompt = _SUMMARY_PROMPT.format(
                 language=chunk.language,
@@ -68,17 +91,23 @@ class GeminiChunkSummarizer:
                 description=chunk.description,
                 code=self._truncate_code(chunk.text),
             )
+            future = self._executor.submit(self.client.complete_text, prompt, model_name=self.model_name)
+            pending[summary_key] = ([chunk], future)
+
+        for summary_key, (members, future) in pending.items():
             try:
-                summary, latency_ms = self.client.complete_text(prompt, model_name=self.model_name)
+                summary, latency_ms = future.result()
             except GeminiClientError as exc:
-                logger.warning("Gemini chunk summary failed for %s: %s", chunk.chunk_id, exc)
+                logger.warning("Gemini chunk summary failed for %s: %s", members[0].chunk_id, exc)
                 continue
 
             cleaned = self._clean_summary(summary)
             if not cleaned:
                 continue
-            summaries_by_chunk_id[chunk.chunk_id] = cleaned
+            for chunk in members:
+                summaries_by_chunk_id[chunk.chunk_id] = cleaned
             to_persist[summary_key] = cleaned
+            self._remember_summary(summary_key, cleaned)
             total_latency_ms += latency_ms
 
         if to_persist:
@@ -86,6 +115,31 @@ class GeminiChunkSummarizer:
 
         return summaries_by_chunk_id, total_latency_ms
 
+    def _cached_summaries(self, keys: list[str]) -> dict[str, str]:
+        # Collected into a per-batch dict: a batch larger than the cache would otherwise evict
+        # its own early hits.
+        found: dict[str, str] = {}
+        missing_keys: list[str] = []
+        for key in keys:
+            summary = self._memory_cache.get(key)
+            if summary is None:
+                missing_keys.append(key)
+            else:
+                self._memory_cache.move_to_end(key)
+                found[key] = summary
+        if missing_keys:
+            stored = self.metadata_store.get_cached_chunk_summaries(missing_keys)
+            for key, summary in stored.items():
+                found[key] = summary
+                self._remember_summary(key, summary)
+        return found
+
+    def _remember_summary(self, key: str, summary: str) -> None:
+        self._memory_cache[key] = summary
+        self._memory_cache.move_to_end(key)
+        if len(self._memory_cache) > self.memory_cache_size:
+            self._memory_cache.popitem(last=False)
+
     @staticmethod
     def apply_summaries(chunks: list[CodeChunk], summaries: dict[str, str]) -> list[CodeChunk]:
         if not summaries:
@@ -105,7 +159,9 @@ class GeminiChunkSummarizer:
             f"{chunk.language}|{chunk.route_method or ''}|{chunk.route_intent or ''}|"
             f"{chunk.route_resource or ''}|{chunk.text}"
         )
-        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+        # Keyed on the chunk text rather than chunk_id/content_hash (the file hash) so identical
+        # code in different files shares a summary.
+        return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
 
     @staticmethod
     def _truncate_code(text: str, limit: int = 2400) -> str:
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+# A prompt is either one string or a tuple of text parts sent as a single multi-part user turn;
+# keeping fixed instructions in their own leading part lets them be reused across requests.
+Prompt = str | tuple[str, ...]
+
+
+# LRU of model completions keyed on a 128-bit digest of the prompt rather than the prompt
+# itself, so the cache does not pin every multi-KB prompt it has seen. Concurrent misses for
+# the same key may both call the model; the last result wins.
+class CompletionCache:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, bytes], str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self,
+        model_name: str,
+        prompt: Prompt,
+        compute: Callable[[str, Prompt], str],
+    ) -> str:
+        key = (model_name, prompt_digest(prompt))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+
+        output = compute(model_name, prompt)
+        with self._lock:
+            self._entries[key] = output
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return output
+
+
+def prompt_digest(prompt: Prompt) -> bytes:
+    hasher = hashlib.blake2b(digest_size=16)
+    if isinstance(prompt, str):
+        hasher.update(prompt.encode("utf-8"))
+        return hasher.digest()
+    # Length-prefix each part so ("ab", "c") and ("a", "bc") stay distinct requests.
+    for part in prompt:
+        encoded = part.encode("utf-8")
+        hasher.update(len(encoded).to_bytes(8, "little"))
+        hasher.update(encoded)
+    return hasher.digest()
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
-import json
 import re
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from functools import lru_cache
 from typing import Any
 
+import orjson
+
+from xtrc.llm.completion_cache import CompletionCache, Prompt
+
 try:
     import google.generativeai as genai
+    from google.api_core.exceptions import DeadlineExceeded
 except ImportError:  # pragma: no cover - exercised in integration environments
     genai = None
+    DeadlineExceeded = TimeoutError  # type: ignore[misc,assignment]
 
+_STRUCTURED_PREFIXES = frozenset("{[\"'`")
 _JSON_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.IGNORECASE | re.DOTALL)
-_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
 
 
 class GeminiClientError(RuntimeError):
@@ -43,20 +48,22 @@ class GeminiClient:
         genai.configure(api_key=api_key)
         self.default_model = default_model
         self.timeout_seconds = timeout_seconds
-        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="xtrc-gemini")
-        self._cached_completion = lru_cache(maxsize=cache_size)(self._generate_uncached)
+        self._completions = CompletionCache(cache_size)
+        # One SDK model object per model name, instead of rebuilding its config and transport
+        # on every call.
+        self._model_for = lru_cache(maxsize=8)(self._build_model)
 
-    def complete_json(self, prompt: str, *, model_name: str | None = None) -> tuple[dict[str, Any], int]:
+    def complete_json(self, prompt: Prompt, *, model_name: str | None = None) -> tuple[dict[str, Any], int]:
         started = time.perf_counter()
         model = model_name or self.default_model
-        raw_text = self._cached_completion(model, prompt)
+        raw_text = self._completions.get_or_compute(model, prompt, self._generate_uncached)
         latency_ms = int((time.perf_counter() - started) * 1000)
         return self._parse_json_object(raw_text), latency_ms
 
     def complete_text(self, prompt: str, *, model_name: str | None = None) -> tuple[str, int]:
         started = time.perf_counter()
         model = model_name or self.default_model
-        raw_text = self._cached_completion(model, prompt)
+        raw_text = self._completions.get_or_compute(model, prompt, self._generate_uncached)
         latency_ms = int((time.perf_counter() - started) * 1000)
         text = self._parse_rewrite_text(raw_text).strip()
         if not text:
@@ -66,19 +73,19 @@ class GeminiClient:
     def rewrite_query(self, prompt: str, *, model_name: str | None = None) -> tuple[str, int]:
         started = time.perf_counter()
         model = model_name or self.default_model
-        raw_text = self._cached_completion(model, prompt)
+        raw_text = self._completions.get_or_compute(model, prompt, self._generate_uncached)
         latency_ms = int((time.perf_counter() - started) * 1000)
         rewritten = self._parse_rewrite_text(raw_text)
         if not rewritten:
             raise GeminiClientError("Gemini rewrite response was empty")
         return rewritten, latency_ms
 
-    def _generate_uncached(self, model_name: str, prompt: str) -> str:
-        future = self._executor.submit(self._call_model, model_name, prompt)
+    def _generate_uncached(self, model_name: str, prompt: Prompt) -> str:
+        # The deadline is enforced by the SDK's HTTP layer, so a timed-out call releases its
+        # thread instead of leaving an abandoned worker blocked on the request.
         try:
-            raw = future.result(timeout=self.timeout_seconds)
-        except FuturesTimeoutError as exc:
-            future.cancel()
+            raw = self._call_model(model_name, prompt)
+        except (DeadlineExceeded, TimeoutError) as exc:
             raise GeminiTimeoutError(f"Gemini request timed out after {self.timeout_seconds:.1f}s") from exc
         except Exception as exc:
             raise GeminiClientError(f"Gemini request failed: {exc}") from exc
@@ -88,17 +95,24 @@ class GeminiClient:
         return raw
 
     @staticmethod
-    def _call_model(model_name: str, prompt: str) -> str:
+    def _build_model(model_name: str) -> Any:
         if genai is None:
             raise GeminiClientError("google-generativeai is unavailable")
-
-        model = genai.GenerativeModel(model_name=model_name)
-        response = model.generate_content(
-            prompt,
+        return genai.GenerativeModel(model_name=model_name)
+
+    def _call_model(self, model_name: str, prompt: Prompt) -> str:
+        contents: Any = prompt
+        if isinstance(prompt, tuple):
+            contents = [{"role": "user", "parts": [{"text": part} for part in prompt]}]
+        response = self._model_for(model_name).generate_content(
+            contents,
             generation_config={
                 "temperature": 0.1,
                 "max_output_tokens": 512,
             },
+            # No SDK retries: its default Retry re-arms the per-attempt timeout for up to 600s,
+            # which would turn timeout_seconds into a minimum rather than a cap.
+            request_options={"timeout": self.timeout_seconds, "retry": None},
         )
 
         text = getattr(response, "text", None)
@@ -126,24 +140,22 @@ class GeminiClient:
 
     @staticmethod
     def _parse_json_object(raw_text: str) -> dict[str, Any]:
-        candidates = [raw_text]
+        # Most responses are a bare object, so only fall back to scanning when that fails.
+        payload = _load_json_object(raw_text)
+        if payload is not None:
+            return payload
 
         for match in _JSON_CODE_BLOCK_RE.finditer(raw_text):
-            candidates.append(match.group(1))
-
-        object_match = _JSON_OBJECT_RE.search(raw_text)
-        if object_match:
-            candidates.append(object_match.group(0))
-
-        for candidate in candidates:
-            snippet = candidate.strip()
-            if not snippet:
-                continue
-            try:
-                payload = json.loads(snippet)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(payload, dict):
+            payload = _load_json_object(match.group(1))
+            if payload is not None:
+                return payload
+
+        # Outermost braces, as a greedy r"\{.*\}" match would select.
+        start = raw_text.find("{")
+        end = raw_text.rfind("}")
+        if start != -1 and end > start:
+            payload = _load_json_object(raw_text[start : end + 1])
+            if payload is not None:
                 return payload
 
         raise GeminiClientError("Gemini did not return a valid JSON object")
@@ -151,18 +163,22 @@ class GeminiClient:
     @staticmethod
     def _parse_rewrite_text(raw_text: str) -> str:
         text = raw_text.strip()
+        # Most rewrites are a bare single line; isprintable() rules out every line break that
+        # splitlines() would honour, so only fenced/JSON/quoted/multi-line text needs parsing.
+        if text and text[0] not in _STRUCTURED_PREFIXES and text.isprintable():
+            return text
         if text.startswith("```"):
             lines = text.splitlines()
             if len(lines) >= 3 and lines[0].startswith("```") and lines[-1].startswith("```"):
                 text = "\n".join(lines[1:-1]).strip()
 
         try:
-            parsed = json.loads(text)
+            parsed = orjson.loads(text)
             if isinstance(parsed, dict):
                 query = parsed.get("query")
                 if isinstance(query, str):
                     return query.strip()
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
         first_line = text.splitlines()[0].strip() if text else ""
@@ -171,3 +187,14 @@ class GeminiClient:
         ):
             first_line = first_line[1:-1].strip()
         return first_line
+
+
+def _load_json_object(candidate: str) -> dict[str, Any] | None:
+    snippet = candidate.strip()
+    if not snippet:
+        return None
+    try:
+        payload = orjson.loads(snippet)
+    except orjson.JSONDecodeError:
+        return None
+    return payload if isinstance(payload, dict) else None
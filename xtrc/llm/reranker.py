@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-import json
 import logging
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass, replace
+from typing import Annotated
 
-from xtrc.core.models import QueryMatch, QuerySelection
+import numpy as np
+import orjson
+from pydantic import BaseModel, Field, StringConstraints, ValidationError
+
+from xtrc.core.models import CodeChunk, QueryMatch, QuerySelection
 from xtrc.llm.gemini_client import GeminiClient, GeminiClientError
 
 logger = logging.getLogger(__name__)
 
-_RERANK_PROMPT = """You are reranking semantic code search candidates.
+# Fixed instructions go in their own leading part so every rerank request starts with the same
+# bytes; the joined parts read exactly like a single prompt.
+_RERANK_PREAMBLE = """You are reranking semantic code search candidates.
 
 Task:
 - Choose the single best code candidate that answers the user query.
@@ -17,18 +27,34 @@ Task:
 - Prefer exact behavioral relevance over lexical overlap.
 
 Return only a JSON object with this schema:
-{{
+{
   "file": "relative/path.py",
   "line": 42,
   "reason": "brief technical explanation"
-}}
+}
+
+"""
 
-User Query:
+_RERANK_QUERY_PART = """User Query:
 {query}
 
-Candidates (JSON):
+"""
+
+_RERANK_CANDIDATES_PART = """Candidates (JSON):
 {candidates_json}
 """
+# The templates are split once at import so building a prompt is plain concatenation.
+_RERANK_QUERY_PREFIX, _, _RERANK_QUERY_SUFFIX = _RERANK_QUERY_PART.partition("{query}")
+_RERANK_CANDIDATES_PREFIX, _, _RERANK_CANDIDATES_SUFFIX = _RERANK_CANDIDATES_PART.partition(
+    "{candidates_json}"
+)
+
+_CANDIDATE_FIELDS_CACHE_SIZE = 2048
+
+# Candidates scoring below this fraction of the best one are not sent to Gemini, but the prompt
+# always keeps at least the top few.
+_CANDIDATE_SCORE_RATIO = 0.5
+_MIN_RERANK_CANDIDATES = 3
 
 _REWRITE_PROMPT = """Rewrite this source-code search query to be more precise and technical.
 
@@ -42,6 +68,17 @@ Rules:
 Query:
 {query}
 """
+_REWRITE_PREFIX, _, _REWRITE_SUFFIX = _REWRITE_PROMPT.partition("{query}")
+
+
+_NonEmptyText = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+
+# Shape of Gemini's rerank answer. Strict mode keeps "42" or true from passing as a line number.
+class _RerankPayload(BaseModel, strict=True):
+    file: _NonEmptyText
+    line: int = Field(gt=0)
+    reason: _NonEmptyText
 
 
 @dataclass(frozen=True)
@@ -53,6 +90,80 @@ class RerankDecision:
     rewritten_query: str | None
 
 
+CandidateFingerprint = tuple[tuple[str, int], ...]
+
+
+# Remembers Gemini rerank decisions for near-duplicate queries. Query embeddings live in one
+# matrix so a lookup is a single matrix-vector product; an entry is only reused when the
+# candidate list it was decided over is identical to the current one.
+class SemanticRerankCache:
+    def __init__(self, *, max_entries: int = 512, min_similarity: float = 0.95) -> None:
+        self.max_entries = max(1, max_entries)
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        self._embeddings: np.ndarray | None = None
+        self._fingerprints: list[CandidateFingerprint] = []
+        self._decisions: list[RerankDecision] = []
+        self._last_used: list[int] = []
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    def get(
+        self,
+        query_embedding: np.ndarray,
+        fingerprint: CandidateFingerprint,
+    ) -> RerankDecision | None:
+        vector = self._unit(query_embedding)
+        with self._lock:
+            if self._embeddings is None or not self._decisions:
+                return None
+            if self._embeddings.shape[1] != vector.shape[0]:
+                return None
+            similarities = self._embeddings[: len(self._decisions)] @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.min_similarity or self._fingerprints[best] != fingerprint:
+                return None
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return self._decisions[best]
+
+    def put(
+        self,
+        query_embedding: np.ndarray,
+        fingerprint: CandidateFingerprint,
+        decision: RerankDecision,
+    ) -> None:
+        vector = self._unit(query_embedding)
+        with self._lock:
+            if self._embeddings is None or self._embeddings.shape[1] != vector.shape[0]:
+                # First entry, or the embedding model changed: start over at the new width.
+                self._embeddings = np.empty((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._fingerprints.clear()
+                self._decisions.clear()
+                self._last_used.clear()
+
+            self._clock += 1
+            if len(self._decisions) < self.max_entries:
+                slot = len(self._decisions)
+                self._fingerprints.append(fingerprint)
+                self._decisions.append(decision)
+                self._last_used.append(self._clock)
+            else:
+                slot = min(range(self.max_entries), key=self._last_used.__getitem__)
+                self._fingerprints[slot] = fingerprint
+                self._decisions[slot] = decision
+                self._last_used[slot] = self._clock
+            self._embeddings[slot] = vector
+
+    @staticmethod
+    def _unit(vector: np.ndarray) -> np.ndarray:
+        flat = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(flat))
+        return flat / norm if norm > 0 else flat
+
+
 class GeminiReranker:
     def __init__(
         self,
@@ -62,14 +173,34 @@ class GeminiReranker:
         threshold: float = 0.85,
         enable_rewrite: bool = False,
         max_candidates: int = 10,
+        semantic_cache: SemanticRerankCache | None = None,
+        rewrite_grace_seconds: float = 1.0,
     ) -> None:
         self.client = client
         self.model_name = model_name
         self.threshold = max(0.0, min(1.0, threshold))
         self.enable_rewrite = enable_rewrite
         self.max_candidates = max(1, max_candidates)
+        self.semantic_cache = (
+            semantic_cache if semantic_cache is not None else SemanticRerankCache()
+        )
+        self.rewrite_grace_seconds = max(0.0, rewrite_grace_seconds)
+        # Per-chunk prompt fields that do not depend on the query, oldest evicted first. Shared
+        # by request threads, so every access holds the lock.
+        self._candidate_fields: OrderedDict[tuple[str, str | None], dict[str, object]] = (
+            OrderedDict()
+        )
+        self._candidate_fields_lock = threading.Lock()
+        # Only the speculative rewrite path uses threads, so the pool is created on first use.
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
 
-    def decide(self, query: str, matches: list[QueryMatch]) -> RerankDecision | None:
+    def decide(
+        self,
+        query: str,
+        matches: list[QueryMatch],
+        query_embedding: np.ndarray | None = None,
+    ) -> RerankDecision | None:
         if not matches:
             return None
 
@@ -92,22 +223,22 @@ class GeminiReranker:
                 rewritten_query=None,
             )
 
-        candidates = matches[: self.max_candidates]
-        rewritten_query: str | None = None
-        total_latency_ms = 0
-
-        query_for_rerank = query
-        if self.enable_rewrite:
-            try:
-                rewrite_prompt = _REWRITE_PROMPT.format(query=query)
-                rewritten_query, rewrite_latency_ms = self.client.rewrite_query(
-                    rewrite_prompt,
-                    model_name=self.model_name,
+        candidates = self._prune_candidates(matches[: self.max_candidates])
+        fingerprint: CandidateFingerprint = tuple(
+            (match.chunk.file_path, match.chunk.start_line) for match in candidates
+        )
+        if query_embedding is not None:
+            cached = self.semantic_cache.get(query_embedding, fingerprint)
+            if cached is not None:
+                logger.info(
+                    "Reusing cached Gemini selection %s:%s",
+                    cached.selection.file,
+                    cached.selection.line,
+                )
+                # The cached rewrite belongs to the query that filled the entry, not this one.
+                return replace(
+                    cached, used_gemini=False, gemini_latency_ms=None, rewritten_query=None
                 )
-                query_for_rerank = rewritten_query
-                total_latency_ms += rewrite_latency_ms
-            except GeminiClientError as exc:
-                logger.warning("Gemini query rewrite failed: %s", exc)
 
         logger.info(
             "Using Gemini reranker model=%s best_vector=%.3f threshold=%.2f",
@@ -116,10 +247,18 @@ class GeminiReranker:
             self.threshold,
         )
 
+        rewritten_query: str | None = None
+        total_latency_ms = 0
         try:
-            prompt = self._build_rerank_prompt(query_for_rerank, candidates)
-            payload, rerank_latency_ms = self.client.complete_json(prompt, model_name=self.model_name)
-            total_latency_ms += rerank_latency_ms
+            if self.enable_rewrite:
+                rewritten_query, payload, total_latency_ms = self._rerank_with_rewrite(
+                    query, candidates
+                )
+            else:
+                prompt = self._build_rerank_prompt(query, candidates)
+                payload, total_latency_ms = self.client.complete_json(
+                    prompt, model_name=self.model_name
+                )
             selection = self._selection_from_payload(payload, candidates)
         except (GeminiClientError, ValueError, KeyError, TypeError) as exc:
             logger.warning("Gemini rerank failed, falling back to top vector match: %s", exc)
@@ -146,53 +285,142 @@ class GeminiReranker:
             selection.line,
             total_latency_ms,
         )
-        return RerankDecision(
+        decision = RerankDecision(
             selection=selection,
             used_gemini=True,
             gemini_model=self.model_name,
             gemini_latency_ms=total_latency_ms,
             rewritten_query=rewritten_query,
         )
+        if query_embedding is not None:
+            self.semantic_cache.put(query_embedding, fingerprint, decision)
+        return decision
 
-    def _build_rerank_prompt(self, query: str, candidates: list[QueryMatch]) -> str:
-        serialized_candidates: list[dict[str, object]] = []
-        for idx, match in enumerate(candidates, start=1):
-            chunk = match.chunk
-            serialized_candidates.append(
-                {
-                    "rank": idx,
-                    "file_path": chunk.file_path,
-                    "line_range": {"start": chunk.start_line, "end": chunk.end_line},
-                    "code_snippet": self._truncate_snippet(chunk.text),
-                    "metadata": {
-                        "language": chunk.language,
-                        "symbol": chunk.symbol,
-                        "symbol_kind": chunk.symbol_kind,
-                        "description": chunk.description,
-                        "llm_summary": chunk.llm_summary,
-                        "route_method": chunk.route_method,
-                        "route_path": chunk.route_path,
-                        "route_intent": chunk.route_intent,
-                        "route_resource": chunk.route_resource,
-                        "intent_tags": chunk.intent_tags,
-                        "keywords": chunk.keywords,
-                        "symbol_terms": chunk.symbol_terms,
-                        "structural_terms": chunk.structural_terms,
-                    },
-                    "scores": {
-                        "hybrid": round(match.score, 6),
-                        "vector": round(match.vector_score, 6),
-                        "keyword": round(match.keyword_score, 6),
-                        "symbol": round(match.symbol_score, 6),
-                    },
-                }
+    def _rerank_with_rewrite(
+        self,
+        query: str,
+        candidates: list[QueryMatch],
+    ) -> tuple[str | None, dict[str, object], int]:
+        # Rerank the original query while the rewrite is in flight. The rewrite only wins if it
+        # lands within the grace period and actually changes the query; otherwise the
+        # speculative rerank is already running and the rewrite costs no wall-clock time.
+        original_prompt = self._build_rerank_prompt(query, candidates)
+        pool = self._rewrite_pool()
+        rerank_future = pool.submit(
+            self.client.complete_json, original_prompt, model_name=self.model_name
+        )
+        rewrite_future = pool.submit(
+            self.client.rewrite_query,
+            _REWRITE_PREFIX + query + _REWRITE_SUFFIX,
+            model_name=self.model_name,
+        )
+
+        rewritten_query: str | None = None
+        try:
+            rewritten_query, rewrite_latency_ms = rewrite_future.result(
+                timeout=self.rewrite_grace_seconds
+            )
+        except FuturesTimeoutError:
+            logger.info(
+                "Gemini query rewrite exceeded %.2fs grace; reranking original query",
+                self.rewrite_grace_seconds,
             )
+        except GeminiClientError as exc:
+            logger.warning("Gemini query rewrite failed: %s", exc)
+
+        if rewritten_query is None or _same_query(rewritten_query, query):
+            payload, rerank_latency_ms = rerank_future.result()
+            return rewritten_query, payload, rerank_latency_ms
 
-        return _RERANK_PROMPT.format(
-            query=query,
-            candidates_json=json.dumps(serialized_candidates, ensure_ascii=True, indent=2),
+        # The in-flight call cannot be interrupted; its result is simply not used.
+        rerank_future.cancel()
+        prompt = self._build_rerank_prompt(rewritten_query, candidates)
+        payload, rerank_latency_ms = self.client.complete_json(prompt, model_name=self.model_name)
+        return rewritten_query, payload, rewrite_latency_ms + rerank_latency_ms
+
+    @staticmethod
+    def _prune_candidates(candidates: list[QueryMatch]) -> list[QueryMatch]:
+        if len(candidates) <= _MIN_RERANK_CANDIDATES:
+            return candidates
+        top_score = max(match.score for match in candidates)
+        if top_score <= 0:
+            return candidates
+        cutoff = top_score * _CANDIDATE_SCORE_RATIO
+        return [
+            match
+            for idx, match in enumerate(candidates)
+            if idx < _MIN_RERANK_CANDIDATES or match.score >= cutoff
+        ]
+
+    def _rewrite_pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=8, thread_name_prefix="xtrc-gemini-rerank"
+                )
+            return self._executor
+
+    def _build_rerank_prompt(
+        self,
+        query: str,
+        candidates: list[QueryMatch],
+    ) -> tuple[str, str, str]:
+        serialized_candidates = [
+            {
+                "rank": idx,
+                **self._static_candidate_fields(match.chunk),
+                "scores": {
+                    "hybrid": round(match.score, 6),
+                    "vector": round(match.vector_score, 6),
+                    "keyword": round(match.keyword_score, 6),
+                    "symbol": round(match.symbol_score, 6),
+                },
+            }
+            for idx, match in enumerate(candidates, start=1)
+        ]
+
+        # Compact UTF-8: indentation and \uXXXX escapes only add input tokens.
+        candidates_json = orjson.dumps(serialized_candidates).decode()
+        return (
+            _RERANK_PREAMBLE,
+            _RERANK_QUERY_PREFIX + query + _RERANK_QUERY_SUFFIX,
+            _RERANK_CANDIDATES_PREFIX + candidates_json + _RERANK_CANDIDATES_SUFFIX,
         )
 
+    def _static_candidate_fields(self, chunk: CodeChunk) -> dict[str, object]:
+        # chunk_id already covers path, span and text; the summary can change independently.
+        key = (chunk.chunk_id, chunk.llm_summary)
+        with self._candidate_fields_lock:
+            fields = self._candidate_fields.get(key)
+        if fields is not None:
+            return fields
+
+        fields = {
+            "file_path": chunk.file_path,
+            "line_range": {"start": chunk.start_line, "end": chunk.end_line},
+            "code_snippet": self._truncate_snippet(chunk.text),
+            "metadata": {
+                "language": chunk.language,
+                "symbol": chunk.symbol,
+                "symbol_kind": chunk.symbol_kind,
+                "description": chunk.description,
+                "llm_summary": chunk.llm_summary,
+                "route_method": chunk.route_method,
+                "route_path": chunk.route_path,
+                "route_intent": chunk.route_intent,
+                "route_resource": chunk.route_resource,
+                "intent_tags": chunk.intent_tags,
+                "keywords": chunk.keywords,
+                "symbol_terms": chunk.symbol_terms,
+                "structural_terms": chunk.structural_terms,
+            },
+        }
+        with self._candidate_fields_lock:
+            self._candidate_fields[key] = fields
+            if len(self._candidate_fields) > _CANDIDATE_FIELDS_CACHE_SIZE:
+                self._candidate_fields.popitem(last=False)
+        return fields
+
     @staticmethod
     def _truncate_snippet(text: str, max_chars: int = 1800) -> str:
         if len(text) <= max_chars:
@@ -201,38 +429,38 @@ class GeminiReranker:
 
     @staticmethod
     def _selection_from_payload(payload: dict[str, object], candidates: list[QueryMatch]) -> QuerySelection:
-        file_path = payload["file"]
-        line = payload["line"]
-        reason = payload["reason"]
+        try:
+            parsed = _RerankPayload.model_validate(payload)
+        except ValidationError as exc:
+            invalid = ", ".join(str(error["loc"][0]) for error in exc.errors() if error["loc"])
+            raise ValueError(f"Gemini output has missing or invalid fields: {invalid}") from exc
+        file_path, line = parsed.file, parsed.line
 
-        if not isinstance(file_path, str) or not file_path.strip():
-            raise ValueError("Gemini output must include non-empty string 'file'")
-        if not isinstance(line, int) or line <= 0:
-            raise ValueError("Gemini output must include positive integer 'line'")
-        if not isinstance(reason, str) or not reason.strip():
-            raise ValueError("Gemini output must include non-empty string 'reason'")
+        # Group once by file; both the containment lookup and the fallback read from this.
+        by_file: dict[str, list[tuple[int, int, QueryMatch]]] = {}
+        for item in candidates:
+            chunk = item.chunk
+            by_file.setdefault(chunk.file_path, []).append((chunk.start_line, chunk.end_line, item))
+
+        same_file_candidates = by_file.get(file_path)
+        if not same_file_candidates:
+            raise ValueError("Gemini selected a file that is not part of the candidate list")
 
         candidate = next(
-            (
-                item
-                for item in candidates
-                if item.chunk.file_path == file_path
-                and item.chunk.start_line <= line <= item.chunk.end_line
-            ),
+            (item for start, end, item in same_file_candidates if start <= line <= end),
             None,
         )
-
         if candidate is None:
-            same_file_candidates = [item for item in candidates if item.chunk.file_path == file_path]
-            if same_file_candidates:
-                candidate = max(same_file_candidates, key=lambda item: item.score)
-                line = candidate.chunk.start_line
-            else:
-                raise ValueError("Gemini selected a file that is not part of the candidate list")
+            candidate = max(same_file_candidates, key=lambda entry: entry[2].score)[2]
+            line = candidate.chunk.start_line
 
         return QuerySelection(
             file=candidate.chunk.file_path,
             line=line,
-            reason=reason.strip(),
+            reason=parsed.reason,
             source="gemini",
         )
+
+
+def _same_query(left: str, right: str) -> bool:
+    return " ".join(left.lower().split()) == " ".join(right.lower().split())
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from functools import lru_cache
+
+from xtrc.llm.completion_cache import CompletionCache
 
 
 class LLMClientError(RuntimeError):
@@ -26,8 +26,7 @@ class LLMTextClient:
         self.provider = provider.strip().lower()
         self.model = model
         self.timeout_seconds = max(0.1, timeout_seconds)
-        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="xtrc-llm")
-        self._cached_completion = lru_cache(maxsize=max(1, cache_size))(self._generate_uncached)
+        self._completions = CompletionCache(cache_size)
 
         if self.provider not in {"gemini", "openai"}:
             raise ValueError(f"Unsupported LLM provider: {provider}")
@@ -38,7 +37,7 @@ class LLMTextClient:
     def complete_text(self, prompt: str, *, model_name: str | None = None) -> tuple[str, int]:
         started = time.perf_counter()
         model = model_name or self.model
-        output = self._cached_completion(model, prompt)
+        output = self._completions.get_or_compute(model, prompt, self._generate_uncached)
         latency_ms = int((time.perf_counter() - started) * 1000)
         text = self._normalize_text(output)
         if not text:
@@ -46,17 +45,19 @@ class LLMTextClient:
         return text, latency_ms
 
     def _generate_uncached(self, model_name: str, prompt: str) -> str:
-        future = self._executor.submit(self._call_model, model_name, prompt)
+        # Both SDKs enforce timeout_seconds on the HTTP request itself, so the call runs on the
+        # caller's thread and a timed-out request does not leave a worker blocked behind it.
         try:
-            output = future.result(timeout=self.timeout_seconds)
-        except FuturesTimeoutError as exc:
-            future.cancel()
-            raise LLMClientTimeoutError(
-                f"LLM request timed out after {self.timeout_seconds:.1f}s"
-            ) from exc
+            return self._call_model(model_name, prompt)
+        except LLMClientError:
+            raise
+        except TimeoutError as exc:
+            raise self._timeout_error() from exc
         except Exception as exc:
             raise LLMClientError(f"LLM request failed: {exc}") from exc
-        return output
+
+    def _timeout_error(self) -> LLMClientTimeoutError:
+        return LLMClientTimeoutError(f"LLM request timed out after {self.timeout_seconds:.1f}s")
 
     def _call_model(self, model_name: str, prompt: str) -> str:
         if self.provider == "gemini":
@@ -66,6 +67,7 @@ class LLMTextClient:
     def _call_gemini(self, model_name: str, prompt: str) -> str:
         try:
             import google.generativeai as genai
+            from google.api_core.exceptions import DeadlineExceeded
         except Exception as exc:  # pragma: no cover
             raise LLMClientError("google-generativeai is not installed") from exc
 
@@ -78,13 +80,19 @@ class LLMTextClient:
             self._gemini_configured = True
 
         model = genai.GenerativeModel(model_name=model_name)
-        response = model.generate_content(
-            prompt,
-            generation_config={
-                "temperature": 0.1,
-                "max_output_tokens": 512,
-            },
-        )
+        try:
+            response = model.generate_content(
+                prompt,
+                generation_config={
+                    "temperature": 0.1,
+                    "max_output_tokens": 512,
+                },
+                # retry=None for the same reason as max_retries=0 below: the SDK's default Retry
+                # would re-arm the timeout on every attempt for up to 600s.
+                request_options={"timeout": self.timeout_seconds, "retry": None},
+            )
+        except DeadlineExceeded as exc:
+            raise self._timeout_error() from exc
 
         text = getattr(response, "text", None)
         if isinstance(text, str) and text.strip():
@@ -115,19 +123,25 @@ class LLMTextClient:
             raise LLMClientError("OPENAI_API_KEY is not set")
 
         try:
-            from openai import OpenAI
+            from openai import APITimeoutError, OpenAI
         except Exception as exc:  # pragma: no cover
             raise LLMClientError("openai package is not installed") from exc
 
         if self._openai_client is None:
-            self._openai_client = OpenAI(api_key=api_key)
+            # No SDK retries: timeout_seconds bounds each attempt, so retries would multiply the
+            # deadline callers rely on.
+            self._openai_client = OpenAI(api_key=api_key, max_retries=0)
 
-        response = self._openai_client.responses.create(
-            model=model_name,
-            input=prompt,
-            temperature=0.1,
-            max_output_tokens=512,
-        )
+        try:
+            response = self._openai_client.responses.create(
+                model=model_name,
+                input=prompt,
+                temperature=0.1,
+                max_output_tokens=512,
+                timeout=self.timeout_seconds,
+            )
+        except APITimeoutError as exc:
+            raise self._timeout_error() from exc
 
         text = getattr(response, "output_text", None)
         if isinstance(text, str) and text.strip():
@@ -151,9 +165,7 @@ class LLMTextClient:
 
     @staticmethod
     def _normalize_text(raw: str) -> str:
-        text = raw.strip()
-        if text.startswith("```"):
-            lines = text.splitlines()
-            if len(lines) >= 3 and lines[0].startswith("```") and lines[-1].startswith("```"):
-                text = "\n".join(lines[1:-1]).strip()
-        return "\n".join(line.rstrip() for line in text.splitlines()).strip()
+        lines = [line.rstrip() for line in raw.strip().splitlines()]
+        if len(lines) >= 3 and lines[0].startswith("```") and lines[-1].startswith("```"):
+            lines = lines[1:-1]
+        return "\n".join(lines).strip()
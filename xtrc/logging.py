@@ -3,12 +3,40 @@ from __future__ import annotations
 import logging
 import os
 
+import orjson
+
+_TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+# For journald/docker and other collectors that stamp records themselves.
+_PLAIN_FORMAT = "%(levelname)s [%(name)s] %(message)s"
+
+
+class _JsonLogFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"level": record.levelname, "logger": record.name, "message": record.getMessage()}
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry).decode()
+
 
 def setup_logging() -> None:
     level = os.getenv("AINAV_LOG_LEVEL", "INFO").upper()
+    log_format = os.getenv("AINAV_LOG_FORMAT", "text").strip().lower()
     if logging.getLogger().handlers:
         return
+
+    # None of the formats read thread or process fields, so skip collecting them per record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    if log_format == "json":
+        handler = logging.StreamHandler()
+        handler.setFormatter(_JsonLogFormatter())
+        logging.basicConfig(level=getattr(logging, level, logging.INFO), handlers=[handler])
+        return
     logging.basicConfig(
         level=getattr(logging, level, logging.INFO),
-        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+        format=_PLAIN_FORMAT if log_format == "plain" else _TEXT_FORMAT,
     )
@@ -1,15 +1,21 @@
 from __future__ import annotations
 
 import logging
-import math
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from dataclasses import replace
 
+import numpy as np
+
 from xtrc.core.models import QueryMatch
 
 logger = logging.getLogger(__name__)
 
+# CrossEncoder.predict has no native timeout, so predictions run here and the caller waits with
+# a deadline. One process-wide worker: predictions are CPU-bound and would only contend.
+_RERANK_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xtrc-local-rerank")
+
 
 class LocalReranker:
     def __init__(
@@ -25,7 +31,7 @@ class LocalReranker:
         self.max_candidates = max(1, max_candidates)
         self.timeout_seconds = max(0.1, timeout_seconds)
         self._model = None
-        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xtrc-local-rerank")
+        self._model_lock = threading.Lock()
 
     def rerank(self, query: str, matches: list[QueryMatch]) -> tuple[list[QueryMatch], bool, int | None]:
         if not self.enabled or len(matches) <= 1:
@@ -36,57 +42,56 @@ class LocalReranker:
 
         try:
             started = time.perf_counter()
-            scores = self._predict_scores(query, target)
+            scores = np.asarray(self._predict_scores(query, target), dtype=np.float64)
             latency_ms = int((time.perf_counter() - started) * 1000)
         except Exception as exc:
             logger.warning("Local reranker skipped due to failure: %s", exc)
             return matches, False, None
 
-        reranked: list[QueryMatch] = []
-        for match, local_score in zip(target, scores, strict=True):
-            combined = 0.7 * match.score + 0.3 * self._sigmoid(local_score)
-            explanation = match.explanation
-            if explanation:
-                explanation = f"{explanation}; local reranker score={local_score:.3f}"
-            else:
-                explanation = f"local reranker score={local_score:.3f}"
-            reranked.append(replace(match, score=combined, explanation=explanation))
+        base = np.fromiter((match.score for match in target), dtype=np.float64, count=len(target))
+        combined = 0.7 * base + 0.3 * self._sigmoid(scores)
+        reranked = [
+            replace(match, score=score, local_rerank_score=local_score)
+            for match, score, local_score in zip(
+                target, combined.tolist(), scores.tolist(), strict=True
+            )
+        ]
 
         reranked.sort(key=lambda item: item.score, reverse=True)
         return reranked + remainder, True, latency_ms
 
-    def _predict_scores(self, query: str, matches: list[QueryMatch]) -> list[float]:
+    def _predict_scores(self, query: str, matches: list[QueryMatch]) -> np.ndarray:
         if not matches:
-            return []
+            return np.empty(0, dtype=np.float64)
 
         pairs = [(query, self._candidate_text(match)) for match in matches]
-        future = self._executor.submit(self._predict_blocking, pairs)
+        future = _RERANK_POOL.submit(self._predict_blocking, pairs)
         try:
             raw_scores = future.result(timeout=self.timeout_seconds)
         except FuturesTimeoutError as exc:
             future.cancel()
             raise RuntimeError(f"Local reranker timed out after {self.timeout_seconds:.1f}s") from exc
 
-        if not isinstance(raw_scores, list):
+        if raw_scores.shape != (len(matches),):
             raise RuntimeError("Local reranker returned invalid score format")
-        return [float(item) for item in raw_scores]
+        return raw_scores
 
-    def _predict_blocking(self, pairs: list[tuple[str, str]]) -> list[float]:
+    def _predict_blocking(self, pairs: list[tuple[str, str]]) -> np.ndarray:
         model = self._load_model()
-        scores = model.predict(pairs)
-        if hasattr(scores, "tolist"):
-            values = scores.tolist()
-            if isinstance(values, list):
-                return [float(item) for item in values]
-        if isinstance(scores, list):
-            return [float(item) for item in scores]
-        return [float(scores)]
+        return np.asarray(model.predict(pairs), dtype=np.float64).reshape(-1)
+
+    def warmup(self) -> None:
+        if self.enabled:
+            self._load_model()
 
     def _load_model(self):
         if self._model is None:
-            from sentence_transformers import CrossEncoder
+            with self._model_lock:
+                # Re-check under the lock so concurrent first requests load the weights once.
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
 
-            self._model = CrossEncoder(self.model_name)
+                    self._model = CrossEncoder(self.model_name)
         return self._model
 
     @staticmethod
@@ -104,5 +109,6 @@ class LocalReranker:
         return "\n".join(lines)
 
     @staticmethod
-    def _sigmoid(value: float) -> float:
-        return 1.0 / (1.0 + math.exp(-value))
+    def _sigmoid(values: np.ndarray) -> np.ndarray:
+        # exp(-log(1 + e^-x)) == 1 / (1 + e^-x), without overflowing for large negative logits.
+        return np.exp(-np.logaddexp(0.0, -values))
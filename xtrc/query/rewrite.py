@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import logging
-from functools import lru_cache
+import threading
+from collections import OrderedDict
 
 from xtrc.llm.text_client import LLMClientError, LLMTextClient
 
@@ -19,6 +20,8 @@ Rules:
 Query:
 {query}
 """
+# Split once so each rewrite is a plain concatenation instead of a str.format parse.
+_REWRITE_PREFIX, _, _REWRITE_SUFFIX = _REWRITE_PROMPT.partition("{query}")
 
 
 class QueryRewriter:
@@ -33,33 +36,57 @@ class QueryRewriter:
         self.llm_client = llm_client
         self.model_name = model_name
         self.enabled = enabled
-        self._cached_rewrite = lru_cache(maxsize=max(1, cache_size))(self._rewrite_uncached)
+        self.cache_size = max(1, cache_size)
+        # Keyed on the canonical query; the prompt itself is built from the caller's text.
+        self._rewrites: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
 
     def rewrite(self, query: str) -> tuple[str, bool, int | None]:
         if not self.enabled or self.llm_client is None:
             return query, False, None
-        normalized = query.strip()
-        if not normalized:
+        canonical = self._canonicalize(query)
+        if not canonical:
             return query, False, None
 
         try:
-            rewritten, latency = self._cached_rewrite(normalized)
+            rewritten, latency = self._cached_rewrite(canonical, query.strip())
         except LLMClientError as exc:
             logger.warning("Query rewrite failed: %s", exc)
             return query, False, None
 
-        if not rewritten:
-            return query, False, None
-        return rewritten, rewritten != query, latency
+        if not rewritten or self._canonicalize(rewritten) == canonical:
+            return query, False, latency
+        return rewritten, True, latency
+
+    def _cached_rewrite(self, canonical: str, query: str) -> tuple[str, int]:
+        with self._lock:
+            cached = self._rewrites.get(canonical)
+            if cached is not None:
+                self._rewrites.move_to_end(canonical)
+                return cached
+
+        result = self._rewrite_uncached(query)
+        with self._lock:
+            self._rewrites[canonical] = result
+            self._rewrites.move_to_end(canonical)
+            if len(self._rewrites) > self.cache_size:
+                self._rewrites.popitem(last=False)
+        return result
 
     def _rewrite_uncached(self, query: str) -> tuple[str, int]:
         if self.llm_client is None:
             return query, 0
-        prompt = _REWRITE_PROMPT.format(query=query)
+        prompt = _REWRITE_PREFIX + query + _REWRITE_SUFFIX
         rewritten, latency = self.llm_client.complete_text(prompt, model_name=self.model_name)
         cleaned = self._clean_rewrite(rewritten)
         return cleaned or query, latency
 
+    @staticmethod
+    def _canonicalize(query: str) -> str:
+        # Cache key only: case, spacing and closing punctuation do not change what the rewrite
+        # should be, so "Create  User?" and "create user" share one cache entry and one LLM call.
+        return " ".join(query.lower().split()).rstrip("?.!").rstrip()
+
     @staticmethod
     def _clean_rewrite(text: str) -> str:
         line = " ".join(text.strip().split())
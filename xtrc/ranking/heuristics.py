@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 from xtrc.core.models import CodeChunk
@@ -31,22 +32,36 @@ class RankingHeuristics:
         self.intent_boost = max(0.1, intent_boost)
 
     def evaluate(self, query: str, chunk: CodeChunk) -> HeuristicDecision:
-        query_terms = set(normalize_terms(query))
-        query_signal = infer_query_signal(query)
+        return self.evaluate_batch(query, [chunk])[0]
 
+    def evaluate_batch(self, query: str, chunks: Iterable[CodeChunk]) -> list[HeuristicDecision]:
+        # Query analysis does not depend on the chunk, so it runs once per batch.
+        query_terms = frozenset(normalize_terms(query))
+        query_intents = infer_query_signal(query).intents
+        route_query = not query_terms.isdisjoint(_ROUTE_QUERY_HINTS)
+        return [self._decide(query_terms, query_intents, route_query, chunk) for chunk in chunks]
+
+    def _decide(
+        self,
+        query_terms: frozenset[str],
+        query_intents: list[str],
+        route_query: bool,
+        chunk: CodeChunk,
+    ) -> HeuristicDecision:
+        tag_set = chunk.intent_tag_set
         multiplier = 1.0
         reasons: list[str] = []
 
-        matched_intents = self._matched_intents(query_signal.intents, chunk.intent_tags)
+        matched_intents = self._matched_intents(query_intents, tag_set)
         if matched_intents:
             multiplier *= self.intent_boost
             reasons.append(f"intent match: {', '.join(matched_intents)}")
 
-        if query_terms.intersection(_ROUTE_QUERY_HINTS) and self._is_route_chunk(chunk):
+        if route_query and self._is_route_chunk(chunk):
             multiplier *= self.route_boost
             reasons.append("route handler boost")
 
-        if _NEGATIVE_INTENTS.intersection(set(chunk.intent_tags)):
+        if not tag_set.isdisjoint(_NEGATIVE_INTENTS):
             multiplier *= self.noise_penalty
             reasons.append("noise/script penalty")
 
@@ -64,10 +79,9 @@ class RankingHeuristics:
         return bool(chunk.route_method) or "route_handler" in chunk.intent_tags or chunk.symbol_kind == "route"
 
     @staticmethod
-    def _matched_intents(query_intents: list[str], tags: list[str]) -> list[str]:
+    def _matched_intents(query_intents: list[str], tag_set: frozenset[str]) -> list[str]:
         if not query_intents:
             return []
-        tag_set = set(tags)
         matched: list[str] = []
         for intent in query_intents:
             key = f"{intent}_resource"
@@ -76,13 +90,6 @@ class RankingHeuristics:
         return sorted(set(matched))
 
     @staticmethod
-    def _matched_keywords(query_terms: set[str], chunk: CodeChunk) -> list[str]:
-        candidate_terms = set(chunk.keywords)
-        candidate_terms.update(chunk.symbol_terms)
-        candidate_terms.update(chunk.structural_terms)
-        if chunk.route_method:
-            candidate_terms.add(chunk.route_method.lower())
-        if chunk.route_resource:
-            candidate_terms.update(normalize_terms(chunk.route_resource))
-        overlap = sorted(query_terms.intersection(candidate_terms))
+    def _matched_keywords(query_terms: frozenset[str], chunk: CodeChunk) -> list[str]:
+        overlap = sorted(query_terms.intersection(chunk.keyword_term_set))
         return overlap[:8]
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import ORJSONResponse
 
 from xtrc.api import build_router
@@ -20,10 +23,17 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     app_settings = settings or Settings.from_env()
     daemon = AinavDaemon(app_settings)
 
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        # Load heavy models before serving so the first query does not pay for them.
+        await run_in_threadpool(daemon.warmup)
+        yield
+
     app = FastAPI(
         title="xtrc",
         version="0.1.0",
         default_response_class=ORJSONResponse,
+        lifespan=lifespan,
     )
     app.include_router(build_router(daemon))
 